@@ -84,9 +84,9 @@ def main(pip: bool = True):
     model = Model(messageHandler)
     datahandler = DataHandler(messageHandler=messageHandler)
     singlePlot = SinglePlot(canvas, model, datahandler, messageHandler)
-    multiPlot = Multiplot(canvas, messageHandler)
+    multiPlot = Multiplot(canvas, messageHandler, datahandler)
     updater = UpdateChecker(pip)
-    histogram = Histogram(canvas, messageHandler)
+    histogram = Histogram(canvas, messageHandler, datahandler)
     gdrive = GDrive(messageHandler)
     globalManager = GlobalManager()
     pylatex = PyLatex()
@@ -26,6 +26,7 @@ from .qt_compat import (
     QT_API_PYSIDE2,
     QT_API_PYSIDE6,
 )
+from .frame_profiler import FrameProfiler
 
 
 class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
@@ -35,6 +36,8 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
     """
 
     dpi_ratio_changed = QtCore.Signal()
+    # Emitted after a frame is painted while profiling
+    frameProfiled = QtCore.Signal()
 
     # map Qt button codes to MouseEvent's ones:
     buttond = {
@@ -75,9 +78,41 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
         self._draw_pending = False
         self._is_drawing = False
         self._draw_rect_callback = lambda painter: None
+        # FrameProfiler, only set in debug mode (see set_profiling)
+        self.profiler = None
+        # Resizes are applied after the geometry stops changing
+        self._geometry_applied = False
+        self._pending_geometry = None
+        self._resize_timer = QtCore.QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(150)
+        self._resize_timer.timeout.connect(self._apply_geometry)
+        # Motion and wheel events are merged and delivered once per frame
+        self._pending_motion = None
+        self._pending_scroll = None
+        self._event_timer = QtCore.QTimer(self)
+        self._event_timer.setSingleShot(True)
+        self._event_timer.setInterval(16)
+        self._event_timer.timeout.connect(self._deliver_pending_events)
 
         self.resize(*self.get_width_height())
 
+    def set_profiling(self, enabled):
+        """Start or stop recording the time spent in each frame stage."""
+        if enabled and self.profiler is None:
+            self.profiler = FrameProfiler()
+        elif not enabled:
+            self.profiler = None
+
+    def set_figure(self, figure):
+        """Display another figure, resized to the current item geometry."""
+        if not hasattr(figure, "_original_dpi"):
+            figure._original_dpi = figure.dpi
+        figure.set_canvas(self)
+        self.figure = figure
+        self._update_figure_dpi()
+        self._apply_geometry(self.boundingRect())
+
     def _update_figure_dpi(self):
         dpi = self.dpi_ratio * self.figure._original_dpi
         self.figure._set_dpi(dpi, forward=False)
@@ -102,7 +137,7 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
             # The easiest way to resize the canvas is to emit a resizeEvent
             # since we implement all the logic for resizing the canvas for
             # that event.
-            self.geometryChanged(self.boundingRect(), self.boundingRect())
+            self._apply_geometry(self.boundingRect())
             # resizeEvent triggers a paintEvent itself, so we exit this one
             # (after making sure that the event is immediately handled).
 
@@ -156,6 +191,8 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
         ):
             self._draw_pending = True
             QtCore.QTimer.singleShot(0, self._draw_idle)
+        elif self.profiler is not None:
+            self.profiler.count("draw_idle_coalesced")
 
     def _draw_idle(self):
         with self._idle_draw_cntx():
@@ -171,12 +208,28 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
                 traceback.print_exc()
 
     def geometryChangeHelper(self, new_geometry, old_geometry):
-        w = new_geometry.width() * self.dpi_ratio
-        h = new_geometry.height() * self.dpi_ratio
+        if not self._geometry_applied:
+            # Nothing was rendered at a real size yet, no preview to stretch
+            self._apply_geometry(new_geometry)
+            return
+        # While the item is being resized the last frame is stretched, the
+        # figure is rendered once the geometry is stable for a while.
+        self._pending_geometry = QtCore.QRectF(new_geometry)
+        self._resize_timer.start()
+        self.update()
+
+    def _apply_geometry(self, geometry=None):
+        """Resize the figure to the item geometry and draw it."""
+        self._resize_timer.stop()
+        if geometry is None:
+            geometry = self._pending_geometry
+        w = geometry.width() * self.dpi_ratio
+        h = geometry.height() * self.dpi_ratio
 
         if (w <= 0.0) or (h <= 0.0):
             return
 
+        self._geometry_applied = True
         dpival = self.figure.dpi
         winch = w / dpival
         hinch = h / dpival
@@ -210,6 +263,7 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
         FigureCanvasBase.enter_notify_event(self, guiEvent=event, xy=(x, y))
 
     def hoverLeaveEvent(self, event):
+        self._deliver_pending_events()
         QtWidgets.QApplication.restoreOverrideCursor()
         FigureCanvasBase.leave_notify_event(self, guiEvent=event)
 
@@ -229,29 +283,47 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
         y = self.figure.bbox.height / dpi_ratio - pos.y()
         return x * dpi_ratio, y * dpi_ratio
 
+    def _deliver_pending_events(self):
+        """Send the merged motion and wheel events to matplotlib."""
+        self._event_timer.stop()
+        motion, self._pending_motion = self._pending_motion, None
+        scroll, self._pending_scroll = self._pending_scroll, None
+        # The Qt events are gone by now, so no guiEvent is passed
+        if motion is not None:
+            FigureCanvasBase.motion_notify_event(self, *motion, guiEvent=None)
+        if scroll is not None:
+            x, y, steps = scroll
+            FigureCanvasBase.scroll_event(self, x, y, steps, guiEvent=None)
+
+    def _queue_motion(self, event):
+        self._pending_motion = self.mouseEventCoords(event.pos())
+        if not self._event_timer.isActive():
+            self._event_timer.start()
+
     def hoverMoveEvent(self, event):
-        x, y = self.mouseEventCoords(event.pos())
-        FigureCanvasBase.motion_notify_event(self, x, y, guiEvent=event)
+        self._queue_motion(event)
 
     # hoverMoveEvent kicks in when no mouse buttons are pressed
     # otherwise mouseMoveEvent are emitted
     def mouseMoveEvent(self, event):
-        x, y = self.mouseEventCoords(event.pos())
-        FigureCanvasBase.motion_notify_event(self, x, y, guiEvent=event)
+        self._queue_motion(event)
 
     def mousePressEvent(self, event):
+        self._deliver_pending_events()
         x, y = self.mouseEventCoords(event.pos())
         button = self.buttond.get(event.button())
         if button is not None:
             FigureCanvasBase.button_press_event(self, x, y, button, guiEvent=event)
 
     def mouseReleaseEvent(self, event):
+        self._deliver_pending_events()
         x, y = self.mouseEventCoords(event.pos())
         button = self.buttond.get(event.button())
         if button is not None:
             FigureCanvasBase.button_release_event(self, x, y, button, guiEvent=event)
 
     def mouseDoubleClickEvent(self, event):
+        self._deliver_pending_events()
         x, y = self.mouseEventCoords(event.pos())
         button = self.buttond.get(event.button())
         if button is not None:
@@ -267,14 +339,20 @@ class FigureCanvasQtQuick(QtQuick.QQuickPaintedItem, FigureCanvasBase):
         else:
             steps = event.pixelDelta().y()
         if steps:
-            FigureCanvasBase.scroll_event(self, x, y, steps, guiEvent=event)
+            if self._pending_scroll is not None:
+                steps += self._pending_scroll[2]
+            self._pending_scroll = (x, y, steps)
+            if not self._event_timer.isActive():
+                self._event_timer.start()
 
     def keyPressEvent(self, event):
+        self._deliver_pending_events()
         key = self._get_key(event)
         if key is not None:
             FigureCanvasBase.key_press_event(self, key, guiEvent=event)
 
     def keyReleaseEvent(self, event):
+        self._deliver_pending_events()
         key = self._get_key(event)
         if key is not None:
             FigureCanvasBase.key_release_event(self, key, guiEvent=event)
@@ -2,6 +2,13 @@
 Render to qtquick from agg.
 """
 
+import pickle
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
 import numpy as np
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 from .backend_qtquick import QtCore, QtGui, FigureCanvasQtQuick
@@ -10,81 +17,271 @@ from .backend_qtquick import QtCore, QtGui, FigureCanvasQtQuick
 class FigureCanvasQtQuickAgg(FigureCanvasAgg, FigureCanvasQtQuick):
     """This class customizes the FigureCanvasQtQuick for Agg"""
 
+    # Emitted from the render thread when a new frame is ready
+    frameRendered = QtCore.Signal()
+
     def __init__(self, figure=None, parent=None):
         super().__init__(figure=figure, parent=parent)
         self.blitbox = None
+        # QPixmap converted from the Agg buffer, reused by paint() until the
+        # buffer is rendered again.
+        self._pixmap = None
+        # State of a running blit interaction (see begin_interaction)
+        self._interaction = None
+        # Background rendering, see set_threaded
+        self._threaded = False
+        self._executor = None
+        self._frame_lock = threading.Lock()
+        # Agg canvas holding the last frame completed by the render thread
+        self._front = None
+        # Incremented on every draw request, older renders are discarded
+        self._generation = 0
+        self.frameRendered.connect(self._on_frame_rendered)
 
-    def paint(self, p):
+    def set_figure(self, figure):
+        if self._interaction is not None:
+            self.end_interaction(redraw=False)
+        self._pixmap = None
+        super().set_figure(figure)
+
+    def set_threaded(self, enabled):
         """
-        Copy the image from the Agg canvas to the qt.drawable.
-        In Qt, all drawing should be done inside of here when a widget is
-        shown onscreen.
+        Render the figure on a worker thread from a snapshot of it, keeping
+        the GUI thread free while a large figure is drawn.
         """
-        self._draw_idle()  # Only does something if a draw is pending.
+        self._threaded = bool(enabled)
+        if self._threaded and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="qtquickagg-render"
+            )
+        self.draw_idle()
+
+    def draw(self):
+        """Render the figure and drop the cached pixmap."""
+        self._pixmap = None
+        if self._threaded and self._interaction is None:
+            try:
+                snapshot = pickle.dumps(self.figure)
+            except Exception:
+                # Some artists can not be pickled, draw them on this thread
+                pass
+            else:
+                self._generation += 1
+                self._executor.submit(
+                    self._render_snapshot, snapshot, self._generation
+                )
+                return
+        self._draw_now()
 
-        # if the canvas does not have a renderer, then give up and wait for
-        # FigureCanvasAgg.draw(self) to be called
-        if not hasattr(self, "renderer"):
+    def _draw_now(self):
+        """Render the figure on this thread."""
+        self._pixmap = None
+        with self._frame_lock:
+            # The synchronous buffer is now the newest frame
+            self._generation += 1
+            self._front = None
+        with self._measure("draw", self.figure):
+            super().draw()
+
+    def _measure(self, stage, figure=None):
+        """Time a frame stage if profiling, counting the figure artists."""
+        if self.profiler is None:
+            return nullcontext()
+        args = {}
+        if figure is not None:
+            args["artists"] = len(figure.findobj())
+        return self.profiler.measure(stage, **args)
+
+    def _render_snapshot(self, snapshot, generation):
+        """Render a pickled figure into a back buffer and swap it to front."""
+        if generation != self._generation:
+            return
+        try:
+            back = FigureCanvasAgg(pickle.loads(snapshot))
+            with self._measure("draw_thread", back.figure):
+                back.draw()
+        except Exception:
+            traceback.print_exc()
             return
+        with self._frame_lock:
+            if generation != self._generation:
+                # A newer draw was requested while rendering
+                return
+            self._front = back
+        self.frameRendered.emit()
 
-        if self.blitbox is None:
-            # matplotlib is in rgba byte order.  QImage wants to put the bytes
-            # into argb format and is in a 4 byte unsigned int.  Little endian
-            # system is LSB first and expects the bytes in reverse order
-            # (bgra).
-            if QtCore.QSysInfo.ByteOrder == QtCore.QSysInfo.LittleEndian:
-                # stringBuffer = self.renderer._renderer.tostring_bgra()
-                #   tostring_xxx do not exist anymore in _renderer
-
-                # patch
-                #  Change QImage format to RGBA8888
-                #    now no conversion needed
-                #    And with bigendian?
-                stringBuffer = np.asarray(self.renderer._renderer).tobytes()
-            else:
-                stringBuffer = self.renderer.tostring_argb()
+    def _on_frame_rendered(self):
+        self._pixmap = None
+        self.update()
+
+    def _frame_buffer(self):
+        """Return the rgba buffer of the last completed frame, if any."""
+        with self._frame_lock:
+            front = self._front
+        if front is not None:
+            return front.buffer_rgba()
+        if hasattr(self, "renderer"):
+            return self.buffer_rgba()
+        return None
 
-            # convert the Agg rendered image -> qImage
+    def _draw_idle(self):
+        """Blit the moving artists while interacting, otherwise draw."""
+        if self._interaction is None:
+            super()._draw_idle()
+            return
+        with self._idle_draw_cntx():
+            if not self._draw_pending:
+                return
+            self._draw_pending = False
+            try:
+                with self._measure("blit"):
+                    self._draw_interaction()
+            except Exception:
+                # Uncaught exceptions are fatal for PyQt5, so catch them.
+                traceback.print_exc()
+
+    def begin_interaction(self, artists=()):
+        """
+        Cache the figure background and, until end_interaction is called,
+        redraw only the given artists on top of it.
+        """
+        if self._interaction is not None:
+            self.end_interaction(redraw=False)
+        artists = [a for a in artists if a.figure is self.figure]
+        for artist in artists:
+            artist.set_animated(True)
+        # Render everything except the animated artists, the background has
+        # to be in this canvas' own buffer to be copied
+        self._draw_now()
+        self._interaction = {
+            "artists": artists,
+            "background": self.copy_from_bbox(self.figure.bbox),
+            "axes": [
+                (ax, ax.transData.frozen())
+                for ax in self.figure.axes
+                if ax.get_visible()
+            ],
+        }
+        self._draw_interaction()
+
+    def end_interaction(self, redraw=True):
+        """Leave the interaction mode and schedule a full draw."""
+        if self._interaction is None:
+            return
+        for artist in self._interaction["artists"]:
+            artist.set_animated(False)
+        self._interaction = None
+        if redraw:
+            self.draw_idle()
+
+    def _draw_interaction(self):
+        """Restore the cached background and draw the animated artists."""
+        state = self._interaction
+        background = state["background"]
+        height = self.figure.bbox.height
+        self.restore_region(background)
+        for ax, start_trans in state["axes"]:
+            # Pixel offset of the data since the background was cached, the
+            # same for every point of the axes while panning.
+            x0, y0, x1, y1 = ax.bbox.extents
+            center = ((x0 + x1) / 2, (y0 + y1) / 2)
+            data = start_trans.inverted().transform(center)
+            dx, dy = ax.transData.transform(data) - center
+            if not (np.isfinite(dx) and np.isfinite(dy)):
+                continue
+            ax.draw_artist(ax.patch)
+            # Regions use top-down pixel coordinates, keep the spines out of
+            # the moved area so they are not dragged along with the data.
+            pad = 1 + int(
+                np.ceil(
+                    max((s.get_linewidth() for s in ax.spines.values()), default=0)
+                    * self.figure.dpi
+                    / 72
+                )
+            )
+            left, top = int(x0) + pad, int(height - y1) + pad
+            right, bottom = int(x1) - pad, int(height - y0) - pad
+            sx, sy = int(round(dx)), int(round(-dy))
+            src = (
+                max(left, left - sx),
+                max(top, top - sy),
+                min(right, right - sx),
+                min(bottom, bottom - sy),
+            )
+            if src[0] < src[2] and src[1] < src[3]:
+                self.restore_region(background, bbox=src, xy=(sx, sy))
+            for spine in ax.spines.values():
+                ax.draw_artist(spine)
+        for artist in state["artists"]:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+        self.blit(self.figure.bbox)
+
+    def _get_pixmap(self):
+        """Return the Agg buffer as a QPixmap, converting it only if needed."""
+        if self._pixmap is None:
+            buf = self._frame_buffer()
+            if buf is None:
+                return None
+            start = time.perf_counter()
+            # Wrap the renderer memory without copying it. Format_RGBA8888 is
+            # byte ordered, so it matches matplotlib's rgba buffer on both
+            # little and big endian systems.
             qImage = QtGui.QImage(
-                stringBuffer,
-                int(self.renderer.width),
-                int(self.renderer.height),
+                buf,
+                buf.shape[1],
+                buf.shape[0],
                 QtGui.QImage.Format_RGBA8888,
             )
             if hasattr(qImage, "setDevicePixelRatio"):
                 # Not available on Qt4 or some older Qt5.
                 qImage.setDevicePixelRatio(self.dpi_ratio)
-            # get the rectangle for the image
-            rect = qImage.rect()
-            # p = QtGui.QPainter(self)
-            # reset the image area of the canvas to be the back-ground color
-            p.eraseRect(rect)
-            # draw the rendered image on to the canvas
-            p.drawPixmap(QtCore.QPoint(0, 0), QtGui.QPixmap.fromImage(qImage))
-
-            # draw the zoom rectangle to the QPainter
-            self._draw_rect_callback(p)
+            # fromImage does the only copy, the pixmap owns its pixels after it
+            self._pixmap = QtGui.QPixmap.fromImage(qImage)
+            if self.profiler is not None:
+                self.profiler.add(
+                    "paint_convert", start, time.perf_counter() - start
+                )
+        return self._pixmap
 
-        else:
-            bbox = self.blitbox
-            # repaint uses logical pixels, not physical pixels like the renderer.
-            l, b, w, h = [pt / self._dpi_ratio for pt in bbox.bounds]
-            t = b + h
-            reg = self.copy_from_bbox(bbox)
-            stringBuffer = reg.to_string_argb()
-            qImage = QtGui.QImage(stringBuffer, w, h, QtGui.QImage.Format_RGBA8888)
+    def paint(self, p):
+        """
+        Copy the image from the Agg canvas to the qt.drawable.
+        In Qt, all drawing should be done inside of here when a widget is
+        shown onscreen.
+        """
+        start = time.perf_counter()
+        self._draw_idle()  # Only does something if a draw is pending.
 
-            if hasattr(qImage, "setDevicePixelRatio"):
-                # Not available on Qt4 or some older Qt5.
-                qImage.setDevicePixelRatio(self.dpi_ratio)
-            pixmap = QtGui.QPixmap.fromImage(qImage)
+        if self.blitbox is not None:
+            # The region was rendered again, so the cached pixmap is stale
+            self._pixmap = None
+            self.blitbox = None
 
-            p.drawPixmap(QtCore.QPoint(l, self.renderer.height - t), pixmap)
+        # if no frame was rendered yet, then give up and wait for
+        # FigureCanvasAgg.draw(self) or the render thread
+        pixmap = self._get_pixmap()
+        if pixmap is None:
+            return
+        # reset the image area of the canvas to be the back-ground color
+        p.eraseRect(QtCore.QRectF(0, 0, self.width(), self.height()))
+        # draw the rendered image on to the canvas
+        if self._resize_timer.isActive():
+            # Preview while resizing, the last frame is stretched to the item
+            p.drawPixmap(
+                QtCore.QRectF(0, 0, self.width(), self.height()),
+                pixmap,
+                QtCore.QRectF(pixmap.rect()),
+            )
+        else:
+            p.drawPixmap(QtCore.QPoint(0, 0), pixmap)
 
-            # draw the zoom rectangle to the QPainter
-            self._draw_rect_callback(p)
+        # overlays, like the zoom rectangle, go on top of the cached pixmap
+        self._draw_rect_callback(p)
 
-            self.blitbox = None
+        if self.profiler is not None:
+            self.profiler.add("paint", start, time.perf_counter() - start)
+            self.frameProfiled.emit()
 
     def blit(self, bbox=None):
         """
@@ -96,10 +293,10 @@ class FigureCanvasQtQuickAgg(FigureCanvasAgg, FigureCanvasQtQuick):
             bbox = self.figure.bbox
 
         self.blitbox = bbox
-        # repaint uses logical pixels, not physical pixels like the renderer.
+        # update uses logical pixels, not physical pixels like the renderer.
         l, b, w, h = [pt / self._dpi_ratio for pt in bbox.bounds]
-        t = b + h
-        self.repaint(l, self.renderer.height - t, w, h)
+        t = self.renderer.height / self._dpi_ratio - (b + h)
+        self.update(QtCore.QRect(int(l), int(t), int(w) + 1, int(h) + 1))
 
     def print_figure(self, *args, **kwargs):
         super().print_figure(*args, **kwargs)
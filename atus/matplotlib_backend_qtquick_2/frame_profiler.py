@@ -0,0 +1,117 @@
+"""
+Frame timing instrumentation for the QtQuick canvases.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class FrameProfiler:
+    """Records the duration of each stage of the frames of a canvas.
+
+    The last ``maxlen`` records are kept, so the statistics follow what the
+    user is doing now instead of the whole session.
+    """
+
+    # Upper edges of the histogram buckets, in milliseconds
+    bucket_edges = (1, 2, 4, 8, 16, 33, 66, 133, 266, np.inf)
+
+    def __init__(self, maxlen=500):
+        self.records = deque(maxlen=maxlen)
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def measure(self, stage, **args):
+        """Time the enclosed block as one record of ``stage``."""
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add(stage, start, time.perf_counter() - start, **args)
+
+    def add(self, stage, start, duration, **args):
+        """Store a record, ``start`` and ``duration`` are in seconds."""
+        self.records.append(
+            (stage, start, duration, threading.get_ident(), args)
+        )
+
+    def count(self, name):
+        """Increment the counter ``name``, like the coalesced draw_idle calls."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def clear(self):
+        self.records.clear()
+        with self._lock:
+            self.counters.clear()
+
+    def summary(self):
+        """Statistics and histogram of each stage, in milliseconds."""
+        durations = {}
+        artists = []
+        for stage, _, duration, _, args in list(self.records):
+            durations.setdefault(stage, []).append(duration * 1e3)
+            if "artists" in args:
+                artists.append(args["artists"])
+        stages = {}
+        for stage, values in durations.items():
+            values = np.asarray(values)
+            hist = np.histogram(values, bins=(0,) + self.bucket_edges)[0]
+            stages[stage] = {
+                "count": int(values.size),
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(values.max()),
+                "last": float(values[-1]),
+                "histogram": [int(n) for n in hist],
+            }
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "stages": stages,
+            "counters": counters,
+            "artists": int(artists[-1]) if artists else 0,
+            "buckets": [str(edge) for edge in self.bucket_edges],
+        }
+
+    def chrome_trace(self):
+        """The records as a Chrome trace (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": stage,
+                "cat": "canvas",
+                "ph": "X",
+                "ts": (start - self._start) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+            for stage, start, duration, tid, args in list(self.records)
+        ]
+        with self._lock:
+            counters = dict(self.counters)
+        events.append(
+            {
+                "name": "counters",
+                "ph": "C",
+                "ts": (time.perf_counter() - self._start) * 1e6,
+                "pid": pid,
+                "args": counters,
+            }
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
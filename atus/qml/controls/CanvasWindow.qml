@@ -137,7 +137,11 @@ ApplicationWindow {
                             selectExisting: false
                             nameFilters: ["Arquivo de imagem .png (*.png)", "Arquivo de imagem .jpg (*.jpg)", "Arquivo de imagem .pdf (*.pdf)", "Arquivo de imagem .svg (*.svg)"]
                             onAccepted: {
-                                canvas.save_plot(fileSaver.fileUrl, bgTransparent.checked)
+                                if (allFormats.checked) {
+                                    canvas.save_plot_formats(fileSaver.fileUrl, bgTransparent.checked, ["png", "pdf", "svg"])
+                                } else {
+                                    canvas.save_plot(fileSaver.fileUrl, bgTransparent.checked)
+                                }
                             }
                         }
                     }
@@ -154,6 +158,12 @@ ApplicationWindow {
                             id: canvasPlaceholder
                             anchors.fill: parent
                         }
+
+                        FrameStatsOverlay{
+                            anchors.top: parent.top
+                            anchors.right: parent.right
+                            anchors.margins: 5
+                        }
                     }
                 }
 
@@ -192,12 +202,21 @@ ApplicationWindow {
                         anchors.rightMargin: 10
                         anchors.bottomMargin: 0
                         anchors.topMargin: 0
+                        ExportProgress{
+                            Layout.fillHeight: true
+                        }
                         CheckBoxCustom{
                             id: bgTransparent
                             Layout.fillHeight: true
                             texto: 'Fundo transparente'
                             checked: false
                         }
+                        CheckBoxCustom{
+                            id: allFormats
+                            Layout.fillHeight: true
+                            texto: 'PNG, PDF e SVG'
+                            checked: false
+                        }
                         IconTextButton{
                             id: canvasSettingsButton
 
@@ -234,10 +253,6 @@ ApplicationWindow {
                             iconUrl: '../../images/icons/content_copy_black_24dp.svg'
                             iconWidth: 17
                             enabled: !bgTransparent.checked
-                            visible: {
-                                if(root.os != 'Windows') false
-                                else true
-                            }
 
                             onClicked: {
                                 canvas.copy_to_clipboard()
@@ -0,0 +1,50 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.11
+import "../colors.js" as Colors
+
+// Progress of the figure export running in background
+RowLayout {
+    id: root
+    visible: canvas.exporting
+    spacing: 5
+
+    Rectangle{
+        id: loadingBar
+        width: 100
+        height: 12
+        color: "transparent"
+        radius: 2
+        border.width: 1
+        border.color: "#fff"
+
+        Rectangle{
+            anchors.top: parent.top
+            anchors.topMargin: 2
+            anchors.left: parent.left
+            anchors.leftMargin: 2
+            color: '#009688'
+            radius: 2
+            height: 8
+            width: (loadingBar.width - 4) * canvas.export_progress
+        }
+    }
+
+    Label{
+        text: (canvas.export_progress * 100).toFixed(0) + '%'
+        font.pixelSize: 11
+        color: '#fff'
+    }
+
+    TextButton{
+        Layout.fillHeight: true
+        radius: 0
+        primaryColor: "transparent"
+        hoverColor: "transparent"
+        clickColor: "transparent"
+        textColor: "#FF5252"
+        textSize: 11
+        texto: "Cancelar"
+        onClicked: canvas.cancel_export()
+    }
+}
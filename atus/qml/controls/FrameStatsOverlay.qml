@@ -0,0 +1,67 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Dialogs 1.3
+import QtQuick.Layouts 1.11
+import "../colors.js" as Colors
+
+// Frame timings of the canvas, shown while the debug mode is on
+Rectangle {
+    id: root
+    property var stats: canvas.frame_stats
+    readonly property var bars: ["▁", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+
+    visible: root.stats.stages !== undefined
+    color: "#B0000000"
+    radius: 3
+    width: layout.implicitWidth + 16
+    height: layout.implicitHeight + 12
+    z: 10
+
+    function histogram(counts) {
+        let top = Math.max(...counts, 1)
+        return counts.map(n => n === 0 ? " " : root.bars[Math.ceil(n / top * 7)]).join("")
+    }
+
+    ColumnLayout {
+        id: layout
+        anchors.centerIn: parent
+        spacing: 4
+
+        Text {
+            color: "#fff"
+            font.family: "monospace"
+            font.pointSize: 8
+            text: {
+                if (root.stats.stages === undefined) return ""
+                let lines = []
+                for (let stage in root.stats.stages) {
+                    let s = root.stats.stages[stage]
+                    lines.push(stage + ": " + s.last.toFixed(1) + " ms  p95 " + s.p95.toFixed(1)
+                               + "  n " + s.count + "  " + root.histogram(s.histogram))
+                }
+                for (let name in root.stats.counters)
+                    lines.push(name + ": " + root.stats.counters[name])
+                lines.push("artists: " + root.stats.artists)
+                return lines.join("\n")
+            }
+        }
+
+        TextButton {
+            Layout.alignment: Qt.AlignRight
+            radius: 0
+            primaryColor: "transparent"
+            textColor: "#4CAF50"
+            texto: "Exportar trace"
+            onClicked: traceSaver.open()
+        }
+    }
+
+    FileDialog {
+        id: traceSaver
+        title: "Escolha um local para salvar o trace"
+        folder: shortcuts.desktop
+        selectExisting: false
+        nameFilters: ["Chrome trace (*.json)"]
+        onAccepted: canvas.export_frame_trace(traceSaver.fileUrl)
+    }
+}
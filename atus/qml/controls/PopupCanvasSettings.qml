@@ -279,6 +279,32 @@ Popup {
                     defaultColor: "#fff"
                     validator: RegExpValidator{regExp: /^[1-9]|[1-9][0-9]|[1-9][0-9][0-9]|1000$/}
                 }
+                TextInputCustom{
+                    id: clipboardScale
+                    Layout.columnSpan: 12
+                    Layout.fillWidth: true
+                    focusColor: Colors.mainColor2
+                    textHolder: ""
+                    text: "1"
+                    title: "Escala da imagem copiada (1 = 150 dpi)"
+                    textColor: "#fff"
+                    defaultColor: "#fff"
+                    validator: RegExpValidator{regExp: /^[0-9]+([.][0-9]+)?$/}
+                }
+                CheckBoxCustom{
+                    id: threadedRendering
+                    Layout.columnSpan: 12
+                    Layout.alignment: Qt.AlignHCenter
+                    checked: false
+                    texto: "Renderizar em segundo plano"
+                }
+                CheckBoxCustom{
+                    id: densityMode
+                    Layout.columnSpan: 12
+                    Layout.alignment: Qt.AlignHCenter
+                    checked: false
+                    texto: "Desenhar pontos como densidade"
+                }
 
                 Text{
                     Layout.columnSpan: 12
@@ -337,6 +363,9 @@ Popup {
                     residualsSize.text = "12"
                     captionSize.text = "12"
                     dpi.text = "500"
+                    clipboardScale.text = "1"
+                    threadedRendering.checked = false
+                    densityMode.checked = false
                     opacity.value = 0.25
                     
                     legendPos.currentIndex = legendPos.find("Automático")
@@ -353,6 +382,9 @@ Popup {
                     canvas.set_font_sizes(titleSize.text, xsize.text, ysize.text, residualsSize.text, captionSize.text)
                     canvas.set_legend_position(legendPos.currentText)
                     canvas.set_dpi(dpi.text)
+                    canvas.set_clipboard_scale(Number(clipboardScale.text))
+                    canvas.set_threaded_rendering(threadedRendering.checked)
+                    canvas.set_density_mode(densityMode.checked)
                     canvas.set_opacity_outliers(opacity.value)
                 }
             }
@@ -0,0 +1,118 @@
+import QtQuick 2.15
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.11
+import "../colors.js" as Colors
+import "../controls"
+
+// Escolha das colunas de x, y, sy e sx de arquivos com mais de 4 colunas
+Popup {
+    id: root
+    anchors.centerIn: Overlay.overlay
+    closePolicy: Popup.CloseOnEscape
+    width: 600
+    modal: true
+    focus: true
+    leftInset: 0
+    rightInset: 0
+    bottomInset: 0
+    topInset: 0
+    margins: 5
+
+    property string dataPath: ""
+    property var columns: []
+
+    onAboutToShow: {
+        colX.currentIndex = 0
+        colY.currentIndex = Math.min(1, root.columns.length - 1)
+        colSy.currentIndex = 0
+        colSx.currentIndex = 0
+    }
+
+    background: Rectangle {
+        anchors.fill: parent
+        border.width: 2
+        border.color: "#fff"
+        color: Colors.color2
+        opacity: 0.95
+        radius: 5
+
+        IconButton{
+            anchors.right: parent.right
+            anchors.rightMargin: -width/3
+            anchors.top: parent.top
+            anchors.topMargin: -width/3
+            width: 30
+            height: 30
+            r: 20
+            z: 1
+            primaryColor: Colors.color1
+            hoverColor: Colors.color1
+            clickColor: Colors.color3
+            iconColor: '#fff'
+            iconUrl: '../../images/icons/close-24px.svg'
+            iconWidth: 20
+            borderWidth: 2
+            borderColor: "#fff"
+
+            onClicked: root.close()
+        }
+    }
+
+    contentItem: GridLayout {
+        columns: 4
+        columnSpacing: 10
+
+        Text {
+            Layout.columnSpan: 4
+            Layout.alignment: Qt.AlignHCenter
+            text: "O arquivo tem " + root.columns.length + " colunas. Escolha as colunas usadas."
+            font.bold: true
+            font.pointSize: 10
+            color: "#4CAF50"
+        }
+        ComboBoxCustom{
+            id: colX
+            Layout.fillWidth: true
+            highlightColor: Colors.mainColor2
+            model: root.columns
+            label: "x"
+        }
+        ComboBoxCustom{
+            id: colY
+            Layout.fillWidth: true
+            highlightColor: Colors.mainColor2
+            model: root.columns
+            label: "y"
+        }
+        ComboBoxCustom{
+            id: colSy
+            Layout.fillWidth: true
+            highlightColor: Colors.mainColor2
+            model: ["Nenhuma"].concat(root.columns)
+            label: "sy"
+        }
+        ComboBoxCustom{
+            id: colSx
+            Layout.fillWidth: true
+            highlightColor: Colors.mainColor2
+            model: ["Nenhuma"].concat(root.columns)
+            label: "sx"
+        }
+        TextButton{
+            Layout.columnSpan: 4
+            Layout.alignment: Qt.AlignHCenter
+            primaryColor: "transparent"
+            textColor: "#4CAF50"
+            texto: "Carregar"
+            radius: 0
+            onClicked: {
+                // "Nenhuma" vira -1, coluna zerada
+                datahandler.load_data_columns(root.dataPath, [
+                    colX.currentIndex, colY.currentIndex,
+                    colSy.currentIndex - 1, colSx.currentIndex - 1
+                ])
+                root.close()
+            }
+        }
+    }
+}
@@ -42,7 +42,8 @@ Window {
     Shortcut {
         sequences: ["CTRL+SHIFT+D"]
         onActivated: {
-            console.log("debug :D")
+            debugMode = !debugMode
+            canvas.set_debug_mode(debugMode)
         }
     }
 
@@ -66,7 +67,6 @@ Window {
         // Verifying which page is active
         onActivated: {
             if (mainWindow.activeBtn === 1) {
-                pagePlot.item.single_plot_table.clear()
                 datahandler.loadDataClipboard_bottom()
             }
         }
@@ -115,6 +115,7 @@ Window {
     property    int activeBtn: 0
     property   bool isGoogleConnected: false
     property   bool rightPanelVisible: true
+    property   bool debugMode: false
 
     // Buttons on leftMenu
     property variant leftMenuBtns: ListModel{
@@ -206,12 +207,13 @@ Window {
         else mainWindow.showMaximized()
     }
 
-    function switchPage(index, canvas){
+    function switchPage(index, hasCanvas){
         leftMenuBtns.setProperty(activeBtn, 'active', false)
         leftMenuBtns.setProperty(index, 'active', true)
         mainWindow.activeBtn = index
 
-        pagePlots.visible = canvas
+        pagePlots.visible = hasCanvas
+        if(hasCanvas) canvas.activate_page(index)
     }
 
     MessageSnackbar{
@@ -826,7 +828,11 @@ Window {
                                                         selectExisting: false
                                                         nameFilters: ["Arquivo de imagem .png (*.png)", "Arquivo de imagem .jpg (*.jpg)", "Arquivo de imagem .pdf (*.pdf)", "Arquivo de imagem .svg (*.svg)"]
                                                         onAccepted: {
-                                                            canvas.save_plot(fileSaver.fileUrl, bgTransparent.checked)
+                                                            if (allFormats.checked) {
+                                                                canvas.save_plot_formats(fileSaver.fileUrl, bgTransparent.checked, ["png", "pdf", "svg"])
+                                                            } else {
+                                                                canvas.save_plot(fileSaver.fileUrl, bgTransparent.checked)
+                                                            }
                                                         }
                                                     }
                                                 }
@@ -847,6 +853,12 @@ Window {
                                                             anchors.fill: parent
                                                             focus: true
                                                     }
+
+                                                    FrameStatsOverlay{
+                                                        anchors.top: parent.top
+                                                        anchors.right: parent.right
+                                                        anchors.margins: 5
+                                                    }
                                                 }
                                             }
 
@@ -885,12 +897,21 @@ Window {
                                                     anchors.rightMargin: 10
                                                     anchors.bottomMargin: 0
                                                     anchors.topMargin: 0
+                                                    ExportProgress{
+                                                        Layout.fillHeight: true
+                                                    }
                                                     CheckBoxCustom{
                                                         id: bgTransparent
                                                         Layout.fillHeight: true
                                                         texto: 'Fundo transparente'
                                                         checked: false
                                                     }
+                                                    CheckBoxCustom{
+                                                        id: allFormats
+                                                        Layout.fillHeight: true
+                                                        texto: 'PNG, PDF e SVG'
+                                                        checked: false
+                                                    }
                                                     IconTextButton{
                                                         id: canvasSettingsButton
 
@@ -927,10 +948,6 @@ Window {
                                                         iconUrl: '../../images/icons/content_copy_black_24dp.svg'
                                                         iconWidth: 17
                                                         enabled: !bgTransparent.checked
-                                                        visible: {
-                                                            if(mainWindow.os != 'Windows') false
-                                                            else true
-                                                        }
 
                                                         onClicked: {
                                                             canvas.copy_to_clipboard()
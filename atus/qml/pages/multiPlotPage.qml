@@ -112,6 +112,34 @@ Item {
                             }
                         }
 
+                        TextButton{
+                            id: btnOpenFolder
+                            height: 25
+                            radius: 3
+                            Layout.fillWidth: true
+                            texto: 'Pasta'
+                            textSize: 10
+                            primaryColor: Colors.c_button
+                            clickColor: Colors.c_button_active
+                            hoverColor: Colors.c_button_hover
+
+                            FileDialog{
+                                id: folderOpen
+                                title: "Escolha a pasta com os arquivos de dados"
+                                folder: shortcuts.desktop
+                                selectFolder: true
+                                onAccepted:{
+                                    globalManager.setLastFolder(folderOpen.fileUrl)
+                                    multiPlot.loadFolder(folderOpen.fileUrl, multiPlotTable.dataShaped.length)
+                                }
+                            }
+
+                            onClicked: {
+                                folderOpen.folder = globalManager.getLastFolder()
+                                folderOpen.open()
+                            }
+                        }
+
                         TextButton{
                             id: btnSave
                             height: 25
@@ -67,9 +67,13 @@ Item {
                                     wsy    : pageFunc.sigmay.checked,
                                     xmin   : pageFunc.xmin.text,
                                     xmax   : pageFunc.xmax.text,
+                                    reduce : pageFunc.reduce.text,
                                     adjust : pageFunc.adjust.checked,
                                 },
-                                data : table.dataShaped
+                                transforms: {
+                                    x: pageFunc.transformX.text,
+                                    y: pageFunc.transformY.text,
+                                },
                             })
 
     // Loader 
@@ -198,6 +202,7 @@ Item {
                                 middleTabs.pageFunc.clearTableParams()
                                 middleTabs.pageFunc.info = ''
                                 label_fileName.text = 'Dados não selecionados'
+                                watchFile.checked = false
                                 singlePlot.new()
                             }
                         }
@@ -293,7 +298,7 @@ Item {
                                 title: "Escolha o arquivo com seus dados"
                                 folder: shortcuts.desktop
                                 selectMultiple: false
-                                nameFilters: ["Arquivos de dados (*.txt *.csv *.tsv)"]
+                                nameFilters: ["Arquivos de dados (*.txt *.csv *.tsv *.npy *.npz *.parquet *.h5 *.hdf5)"]
                                 onAccepted:{
                                     table.clear()
                                     globalManager.setLastFolder(fileOpen.fileUrl)
@@ -309,7 +314,7 @@ Item {
                         Text {
                             id: label_fileName
                             Layout.fillWidth: true
-                            Layout.columnSpan: 3
+                            Layout.columnSpan: 2
                             color: "#fff"
                             font.pointSize: 10
                             fontSizeMode: Text.Fit
@@ -318,6 +323,13 @@ Item {
                             wrapMode: Text.Wrap
                             text: qsTr("Dados não selecionados")
                         }
+                        CheckBoxCustom{
+                            id: watchFile
+                            Layout.columnSpan: 1
+                            checked: false
+                            texto: "Acompanhar"
+                            onCheckedChanged: datahandler.set_watch(checked)
+                        }
                     }
                 }
 
@@ -325,9 +337,7 @@ Item {
                     id: table
                     Layout.fillWidth: true
                     Layout.fillHeight: true
-                    dataModel: ListModel{
-                        id: dataSet
-                    }
+                    dataModel: datahandler.table
                 }
             }
 
@@ -350,17 +360,19 @@ Item {
         //     table.addRow(x, y, sy, sx, Boolean(Number(isEditable)))
         // }
 
-        function onUploadData(data, fileName){
+        function onUploadData(fileName){
             label_fileName.text = fileName
-            let dataLength = data['x'].length
-            if (dataLength > 150) messageHandler.raise_warn(`Seus ${dataLength} dados são poderosos demais, apenas as 150 primeiras linhas serão mostradas na tabela.`)
-            for (let i = 0; i < dataLength; i++){
-                if (i < 150)
-                    table.addRow(data['x'][i], data['y'][i], (data['sy'] === undefined ? '0':data['sy'][i]), (data['sx'] === undefined ? '0':data['sx'][i]), true)
-                else
-                    table.addExtraRow(data['x'][i], data['y'][i], (data['sy'] === undefined ? '0':data['sy'][i]), (data['sx'] === undefined ? '0':data['sx'][i]))
-            }
         }
+
+        function onChooseColumns(dataPath, columns){
+            popupColumns.dataPath = dataPath
+            popupColumns.columns = columns
+            popupColumns.open()
+        }
+    }
+
+    PopupColumns{
+        id: popupColumns
     }
 
     Connections{
@@ -436,6 +448,9 @@ Item {
             pageFunc.adjust.checked         = props['fitProps']['adjust']
             pageFunc.xmin.text              = props['fitProps']['xmin']
             pageFunc.xmax.text              = props['fitProps']['xmax']
+            pageFunc.reduce.text            = props['fitProps']['reduce'] || ''
+            pageFunc.transformX.text        = (props['transforms'] || {})['x'] || ''
+            pageFunc.transformY.text        = (props['transforms'] || {})['y'] || ''
         }
     }
 }
@@ -14,6 +14,9 @@ Item {
     property alias adjust: switch_adjust
     property alias xmin  : x_min
     property alias xmax  : x_max
+    property alias reduce: reduce_tol
+    property alias transformX: transform_x
+    property alias transformY: transform_y
     property alias info  : infos.text
 
     // Functions
@@ -76,11 +79,32 @@ Item {
             validator: RegExpValidator{regExp: /^[\[\];0-9.a-zA-Z_@= ,-]+$/}
         }
 
+        // Transformações das colunas antes do gráfico e do ajuste
         C.TextField {
-            id: x_min
+            id: transform_x
+            Layout.fillWidth: true
+            Layout.columnSpan: 6
+            activeColor: Colors.mainColor2
+            title: 'Dados | x →'
+            helperText: 'Ex.: 1/x^2, log(x)'
+            validator: RegExpValidator{regExp: /^[0-9a-zA-Z.()\-*^_+/ ]+$/}
+        }
+
+        C.TextField {
+            id: transform_y
             Layout.fillWidth: true
             Layout.columnSpan: 6
             activeColor: Colors.mainColor2
+            title: 'Dados | y →'
+            helperText: 'Ex.: ln(y), y/x'
+            validator: RegExpValidator{regExp: /^[0-9a-zA-Z.()\-*^_+/ ]+$/}
+        }
+
+        C.TextField {
+            id: x_min
+            Layout.fillWidth: true
+            Layout.columnSpan: 4
+            activeColor: Colors.mainColor2
             title: 'Ajuste | x mín.'
             helperText: 'Ex.: 0, 32, 4.3, 23.4'
             validator: RegExpValidator{regExp: /^[\-]?[0-9]+([\.]?[0-9]+)?$/}
@@ -89,13 +113,23 @@ Item {
         C.TextField {
             id: x_max
             Layout.fillWidth: true
-            Layout.columnSpan: 6
+            Layout.columnSpan: 4
             activeColor: Colors.mainColor2
             title: 'Ajuste | x máx.'
             helperText: 'Ex.: 0, 32, 4.3, 23.4'
             validator: RegExpValidator{regExp: /^[\-]?[0-9]+([\.]?[0-9]+)?$/}
         }
 
+        C.TextField {
+            id: reduce_tol
+            Layout.fillWidth: true
+            Layout.columnSpan: 4
+            activeColor: Colors.mainColor2
+            title: 'Ajuste | agrupar x'
+            helperText: 'Vazio: não agrupa; 0: x iguais'
+            validator: RegExpValidator{regExp: /^[0-9]+([\.]?[0-9]+)?$/}
+        }
+
         C.CheckBoxCustom{
             id: switch_sigmax
             Layout.alignment: Qt.AlignHCenter | Qt.AlignVCenter
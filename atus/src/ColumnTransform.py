@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+MIT License
+
+Copyright (c) 2021 Leonardo Eiji Tamayose, Guilherme Ferrari Fortino
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import ast
+
+import numpy as np
+
+
+class ColumnTransform:
+    """
+    Expressão aplicada a uma coluna inteira, como ``log(y)`` ou ``1/x^2``.
+
+    A expressão é validada e compilada uma única vez e depois avaliada sobre
+    os arrays de x e y. A incerteza da coluna nova é propagada em primeira
+    ordem, supondo x e y independentes:
+
+        s_f² = (df/dx * sx)² + (df/dy * sy)²
+
+    As derivadas vêm do passo complexo, f(x + ih) = f(x) + ih f'(x) + O(h²):
+    como não há subtração, o resultado é exato até a precisão do float para
+    todas as funções aceitas.
+    """
+
+    variables = ("x", "y")
+    _functions = {
+        "sin": np.sin,
+        "cos": np.cos,
+        "tan": np.tan,
+        "arcsin": np.arcsin,
+        "arccos": np.arccos,
+        "arctan": np.arctan,
+        "asin": np.arcsin,
+        "acos": np.arccos,
+        "atan": np.arctan,
+        "sinh": np.sinh,
+        "cosh": np.cosh,
+        "tanh": np.tanh,
+        "exp": np.exp,
+        "log": np.log,
+        "ln": np.log,
+        "log10": np.log10,
+        "log2": np.log2,
+        "sqrt": np.sqrt,
+        "pi": np.pi,
+        "e": np.e,
+    }
+    # Só aritmética, chamadas das funções acima e números
+    _nodes = (
+        ast.Expression,
+        ast.BinOp,
+        ast.UnaryOp,
+        ast.Call,
+        ast.Name,
+        ast.Load,
+        ast.Constant,
+        ast.operator,
+        ast.unaryop,
+    )
+    _step = 1e-20
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression.strip()
+        tree = ast.parse(self.expression.replace("^", "**"), mode="eval")
+        names = set()
+        # Nomes chamados; uma função só aparece assim, nunca como valor
+        called = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, self._nodes):
+                raise ValueError("Operação não permitida na transformação.")
+            if isinstance(node, ast.Call):
+                if not (
+                    isinstance(node.func, ast.Name)
+                    and callable(self._functions.get(node.func.id))
+                ):
+                    raise ValueError("Só as funções da lista podem ser chamadas.")
+                if len(node.args) != 1 or node.keywords:
+                    raise ValueError(
+                        f"A função {node.func.id} recebe exatamente um argumento."
+                    )
+                called.add(id(node.func))
+            if isinstance(node, ast.Constant) and not isinstance(
+                node.value, (int, float)
+            ):
+                raise ValueError("Operação não permitida na transformação.")
+            if isinstance(node, ast.Name):
+                if node.id not in self._functions and node.id not in self.variables:
+                    raise ValueError(f"Nome desconhecido na transformação: {node.id}.")
+                if callable(self._functions.get(node.id)) and id(node) not in called:
+                    raise ValueError(f"A função {node.id} precisa de um argumento.")
+                names.add(node.id)
+        # Colunas usadas pela expressão, as únicas que precisam de derivada
+        self.depends = tuple(name for name in self.variables if name in names)
+        self._code = compile(tree, "<transform>", "eval")
+
+    def __repr__(self) -> str:
+        return f"ColumnTransform({self.expression!r})"
+
+    def _evaluate(self, columns: dict[str, np.ndarray]) -> np.ndarray:
+        return eval(self._code, {"__builtins__": {}, **self._functions}, columns)
+
+    def apply(
+        self, columns: dict[str, np.ndarray], errors: dict[str, np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Valores e incertezas da coluna nova.
+
+        ``columns`` e ``errors`` têm os arrays de x, y e de sx, sy. Linhas fora
+        do domínio da expressão ficam com nan ou inf.
+        """
+        # Cópias: a expressão nunca recebe as colunas do store
+        columns = {
+            name: np.array(columns[name], dtype=np.float64) for name in self.variables
+        }
+        size = len(columns["x"])
+        with np.errstate(all="ignore"):
+            values = np.broadcast_to(
+                np.asarray(self._evaluate(columns), dtype=np.float64), size
+            ).copy()
+            variance = np.zeros(size)
+            for name in self.depends:
+                shifted = dict(columns)
+                shifted[name] = columns[name] + 1j * self._step
+                derivative = np.imag(self._evaluate(shifted)) / self._step
+                # Coluna sem incerteza não contribui, mesmo com derivada infinita
+                variance += np.where(
+                    errors[name] == 0.0, 0.0, (derivative * errors[name]) ** 2
+                )
+        variance[~np.isfinite(values)] = np.nan
+        return values, np.sqrt(variance)
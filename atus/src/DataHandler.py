@@ -3,40 +3,97 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 from PyQt5.QtCore import (
+    QFileSystemWatcher,
     QObject,
     QJsonValue,
+    QTimer,
     QUrl,
-    QVariant,
+    pyqtProperty,
     pyqtSignal,
     pyqtSlot,
 )
-from copy import deepcopy
+from .ColumnTransform import ColumnTransform
+from .DataStore import DataStore
+from .DataTableModel import DataTableModel
 from .MessageHandler import MessageHandler
+from .ParseCache import parse_cache
 from PyQt5.QtGui import QGuiApplication
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
+import glob
+import mmap
+import os
+import re
+import weakref
 
 
 # data_handler
 class DataHandler(QObject):
     # Signals plot
-    uploadData = pyqtSignal(QVariant, str, arguments=["data", "fileName"])
+    uploadData = pyqtSignal(str, arguments=["fileName"])
+    # Arquivo com mais de 4 colunas: a interface escolhe x, y, sy e sx
+    chooseColumns = pyqtSignal(str, list, arguments=["dataPath", "columns"])
+    # Linhas novas do arquivo acompanhado já estão no store
+    dataAppended = pyqtSignal()
+
+    _columns = {0: "x", 1: "y", 2: "sy", 3: "sx"}
+    # Trecho inicial usado para detectar a vírgula decimal
+    _sniff_size = 1 << 16
+    # Linhas lidas para contar as colunas de um arquivo
+    _peek_rows = 20
+    # Arquivos aceitos pelo carregamento em lote
+    _text_formats = (".csv", ".txt", ".tsv")
+    # Intervalo mínimo entre leituras do arquivo acompanhado, em ms
+    _watch_interval = 500
+    # Colunas que aceitam transformação e a incerteza de cada uma
+    _transformable = {"x": "sx", "y": "sy"}
+    # Formatos binários e o pacote opcional que cada um precisa
+    _binary_formats = {
+        ".npy": None,
+        ".npz": None,
+        ".parquet": "pyarrow",
+        ".h5": "h5py",
+        ".hdf5": "h5py",
+    }
 
     def __init__(self, messageHandler) -> None:
         super().__init__()
         self._msg_handler: MessageHandler = messageHandler
         self._df: pd.DataFrame = None
-        self._data_json: pd.DataFrame = None
         self._has_sx: bool = True
         self._has_sy: bool = True
         self._has_data: bool = False
-        self._data: pd.DataFrame = None
+        self._table = DataTableModel(messageHandler, self)
+        # Store (weakref) e versão já checados por load_table
+        self._checked: tuple[weakref.ref, int] = (lambda: None, -1)
+        # Arquivo de texto carregado, opções de leitura e bytes já lidos
+        self._source: tuple[str, dict] | None = None
+        self._offset = 0
+        self._watching = False
+        # Criado só quando o acompanhamento é ligado
+        self._watcher: QFileSystemWatcher = None
+        self._watch_timer = QTimer(self)
+        self._watch_timer.setSingleShot(True)
+        self._watch_timer.setInterval(self._watch_interval)
+        self._watch_timer.timeout.connect(self._read_appended)
+        # Transformações de x e y e o último store transformado
+        self._transforms: dict[str, ColumnTransform] = {}
+        # Store de origem, suas versões, o store transformado e o domínio válido
+        self._derived: tuple[weakref.ref, int, int, DataStore, np.ndarray] = (
+            lambda: None,
+            -1,
+            -1,
+            None,
+            None,
+        )
 
     def reset(self) -> None:
-        self._data = None
-        self._data_json = None
+        self._table.set_store(None)
         self._has_data = False
         self._has_sx = True
         self._has_sy = True
+        self._set_source(None)
+        self.set_transforms(None)
 
     def _is_number(self, s: any) -> bool:
         if isinstance(s, str):
@@ -47,14 +104,14 @@ class DataHandler(QObject):
         except Exception:
             return False
 
-    def _read_csv(self, data_path: str) -> None:
+    def _read_csv(self, data_path: str, columns: list[int] | None = None) -> None:
         try:
-            self._df = (
-                pd.read_csv(data_path, sep=",", header=None, dtype=str)
-                .dropna(how="all")
-                .replace(np.nan, "0")
-            )
-            self._df = self._df.rename({0: "x", 1: "y", 2: "sy", 3: "sx"}, axis=1)
+            if columns is None and self._asks_columns(data_path, sep=","):
+                return None
+            options = dict(sep=",", columns=columns)
+            size = self._complete_size(data_path)
+            self._df = self._parse_numeric(data_path, size=size, **options)
+            self._set_source(data_path, options, offset=size)
             return None
         except pd.errors.ParserError:
             self._msg_handler.raise_error(
@@ -68,26 +125,187 @@ class DataHandler(QObject):
             )
             return None
 
-    def _read_tsv_txt(self, data_path: str) -> None:
+    def _read_tsv_txt(self, data_path: str, columns: list[int] | None = None) -> None:
         try:
-            self._df = (
-                pd.read_csv(
-                    data_path,
-                    sep=r"\t|\s",
-                    header=None,
-                    dtype=str,
-                    engine="python",
-                )
-                .dropna(how="all")
-                .replace(np.nan, "0")
+            with open(data_path, encoding="utf-8") as file:
+                sample = file.read(self._sniff_size)
+            if columns is None and self._asks_columns(data_path, sep=r"\s+"):
+                return None
+            options = dict(
+                sep=r"\s+", decimal=self._sniff_decimal(sample), columns=columns
             )
-            self._df = self._df.rename({0: "x", 1: "y", 2: "sy", 3: "sx"}, axis=1)
+            size = self._complete_size(data_path)
+            self._df = self._parse_numeric(data_path, size=size, **options)
+            self._set_source(data_path, options, offset=size)
         except pd.errors.ParserError:
             self._msg_handler.raise_error(
                 "Separação de colunas de arquivos txt e tsv são com tab ou espaço. Rever dados de entrada."
             )
             return None
 
+        except UnicodeDecodeError:
+            self._msg_handler.raise_error(
+                "O encoding do arquivo é inválido. Use o utf-8."
+            )
+            return None
+
+    def _complete_size(self, data_path: str) -> int:
+        """Bytes do arquivo a ler agora.
+
+        Acompanhando o arquivo, só até a última linha completa: uma linha
+        ainda sendo escrita fica para ``_read_appended``.
+        """
+        size = os.path.getsize(data_path)
+        if not self._watching:
+            return size
+        with open(data_path, "rb") as file:
+            while size > 0:
+                start = max(size - self._sniff_size, 0)
+                file.seek(start)
+                end = file.read(size - start).rfind(b"\n")
+                if end >= 0:
+                    return start + end + 1
+                size = start
+        return 0
+
+    def _asks_columns(self, data_path: str, sep: str) -> bool:
+        """Pede a escolha das colunas quando o arquivo tem mais de 4.
+
+        Só as primeiras linhas são lidas. A primeira linha, quando não é
+        numérica, dá o nome das colunas.
+        """
+        first = pd.read_csv(
+            data_path,
+            sep=sep,
+            header=None,
+            nrows=self._peek_rows,
+            dtype=str,
+            engine="c",
+        ).iloc[0]
+        if len(first) <= len(DataStore.columns):
+            return False
+        self._ask_columns(
+            data_path,
+            [
+                f"{i + 1}: {name}" if isinstance(name, str) else f"Coluna {i + 1}"
+                for i, name in enumerate(first.where(~first.map(self._is_number)))
+            ],
+        )
+        return True
+
+    def _ask_columns(self, data_path: str, labels: list[str]) -> None:
+        self._df = None
+        self.chooseColumns.emit(QUrl.fromLocalFile(data_path).toString(), labels)
+
+    def _map_columns(self, values: np.ndarray, columns: list[int]) -> np.ndarray:
+        """Colunas (k, n) de origem para x, y, sy e sx; -1 deixa a coluna zerada."""
+        mapped = np.zeros((len(DataStore.columns), values.shape[1]))
+        for i, column in enumerate(columns):
+            if column >= 0:
+                mapped[i] = values[column]
+        return mapped
+
+    def _sniff_decimal(self, sample: str) -> str:
+        """Vírgula decimal quando o separador é tab ou espaço e há vírgulas."""
+        return "," if "," in sample else "."
+
+    def _parse_numeric(
+        self,
+        source: str | StringIO,
+        sep: str,
+        decimal: str = ".",
+        columns: list[int] | None = None,
+        warn=None,
+        size: int | None = None,
+    ) -> pd.DataFrame:
+        """Lê os dados numa única passada do engine C, já em float64.
+
+        Colunas que o parser não converteu sozinho (cabeçalhos, vírgula e ponto
+        misturados) são convertidas de forma vetorizada. Células vazias viram 0
+        e linhas com valores não numéricos são removidas por máscara.
+
+        ``columns`` são as colunas de origem de x, y, sy e sx (-1 quando não
+        há); só elas são lidas do arquivo. ``warn`` recebe os avisos no lugar
+        do MessageHandler. ``size`` limita a leitura aos primeiros bytes do
+        arquivo, mesmo que ele cresça durante o parse.
+
+        Arquivos já lidos com as mesmas opções, e não alterados desde então,
+        vêm do parse_cache.
+        """
+        warn = warn or self._msg_handler.raise_warn
+        key = None
+        if isinstance(source, str):
+            key = parse_cache.key(source, sep=sep, decimal=decimal, columns=columns)
+            if key is not None and size is not None and key[2] != size:
+                # Só parte do arquivo é lida: a chave não descreve o resultado
+                key = None
+            cached = parse_cache.get(key)
+            if cached is not None:
+                values, (names, messages) = cached
+                for message in messages:
+                    warn(message)
+                return pd.DataFrame(values.copy(), columns=names)
+        messages = []
+        if size is not None:
+            df = self._parse_prefix(source, size, sep, decimal, columns, messages)
+        else:
+            df = self._parse_text(source, sep, decimal, columns, messages.append)
+        for message in messages:
+            warn(message)
+        # Texto colado e linhas novas não têm chave: nada de cópia para o cache
+        if key is not None and df.size * 8 <= parse_cache.max_bytes:
+            parse_cache.put(key, df.to_numpy(copy=True), (list(df.columns), messages))
+        return df
+
+    def _parse_prefix(
+        self, data_path: str, size: int, sep: str, decimal: str, columns, messages
+    ) -> pd.DataFrame:
+        """Parse dos primeiros ``size`` bytes, mapeados sem cópia."""
+        if size == 0:
+            return self._parse_text(
+                StringIO(""), sep, decimal, columns, messages.append
+            )
+        with open(data_path, "rb") as file, mmap.mmap(
+            file.fileno(), size, access=mmap.ACCESS_READ
+        ) as view:
+            return self._parse_text(view, sep, decimal, columns, messages.append)
+
+    def _parse_text(
+        self, source: str | StringIO, sep: str, decimal: str, columns, warn
+    ) -> pd.DataFrame:
+        options = dict(sep=sep, header=None, decimal=decimal, engine="c")
+        if columns is not None:
+            options["usecols"] = sorted({column for column in columns if column >= 0})
+        try:
+            # Caso comum: só números, sem inferência de tipos
+            df = pd.read_csv(source, dtype=np.float64, **options)
+        except pd.errors.ParserError:
+            raise
+        except ValueError:
+            if not isinstance(source, str):
+                source.seek(0)
+            df = pd.read_csv(source, low_memory=False, **options)
+        df = df.dropna(how="all")
+        missing = df.isna().to_numpy()
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = pd.to_numeric(
+                    df[col].str.replace(",", ".", regex=False), errors="coerce"
+                )
+        values = df.to_numpy(dtype=np.float64)
+        values[missing] = 0.0
+        keep = ~np.isnan(values).any(axis=1)
+        if not keep.all():
+            warn("Linhas com valores não numéricos removidas.")
+            values = values[keep]
+        if columns is not None:
+            position = {column: i for i, column in enumerate(df.columns)}
+            values = self._map_columns(
+                values.T, [position.get(column, -1) for column in columns]
+            ).T
+            return pd.DataFrame(values, columns=list(DataStore.columns))
+        return pd.DataFrame(values, columns=df.columns).rename(self._columns, axis=1)
+
     def _fill_df_with_array(
         self, df_array: list[list[str, str, str, str, bool]] | None
     ) -> None:
@@ -111,16 +329,9 @@ class DataHandler(QObject):
             self._has_sx = False
 
     def _to_float(self, df: pd.DataFrame) -> tuple[pd.DataFrame, None]:
-        for col in df.columns:
-            df[col] = df[col].astype(float)
-            # try:
-            #     df[col] = df[col].astype(float)
-            # except ValueError:
-            #     self._msg_handler.raise_error(
-            #         "A entrada de dados só permite entrada de números. Rever arquivo de entrada."
-            #     )
-            #     return None
-        return df
+        # Frame novo: df pode ser um recorte de outro e não deve ser alterado
+        columns = {col: float for col in df.columns if df[col].dtype != np.float64}
+        return df.astype(columns) if columns else df
 
     def _comma_to_dot(self, df: pd.DataFrame) -> pd.DataFrame:
         # df = self._drop_header(df)
@@ -130,93 +341,327 @@ class DataHandler(QObject):
                 df[col] = df[col].astype(str)
         return df
 
-    def _to_check_columns(
-        self, df: pd.DataFrame, df_json: pd.DataFrame
-    ) -> tuple[pd.DataFrame, pd.DataFrame] | tuple[None, None]:
+    def _to_check_columns(self, df: pd.DataFrame) -> pd.DataFrame | None:
         number_of_cols = len(df.columns)
         if number_of_cols == 1:
             self._has_sy = not self._has_sy
             self._has_sx = not self._has_sx
             df["y"] = df["x"].copy()
             df["x"] = np.arange(len(df), dtype=float)
-            df_json = deepcopy(df.astype(str))
-            df_json.columns = ["x", "y"]
             df.insert(2, "sy", 0.0)
             df.insert(3, "sx", 0.0)
-            return df, df_json
+            return df
         elif number_of_cols == 2:
             self._has_sy = not self._has_sy
             self._has_sx = not self._has_sx
-            df_json = deepcopy(df.astype(str))
-            df_json.columns = ["x", "y"]
             df.insert(2, "sy", 0.0)
             df.insert(3, "sx", 0.0)
-            return df, df_json
+            return df
         elif number_of_cols == 3:
             self._has_sx = not self._has_sx
-            df_json = deepcopy(df.astype(str))
-            df_json.columns = ["x", "y", "sy"]
             df.insert(3, "sx", 0.0)
-            unique_sy = df_json["sy"].astype(float).unique()
+            unique_sy = df["sy"].astype(float).unique()
             if 0.0 in unique_sy:
                 if len(unique_sy) > 1:
                     self._msg_handler.raise_warn(
                         "Um valor nulo foi encontrado nas incertezas em y, removendo coluna de sy."
                     )
                 self._has_sy = False
-            return df, df_json
+            return df
         elif number_of_cols == 4:
-            df_json = deepcopy(df.astype(str))
-            df_json.columns = ["x", "y", "sy", "sx"]
-            unique_sy = df_json["sy"].astype(float).unique()
+            unique_sy = df["sy"].astype(float).unique()
             if 0.0 in unique_sy:
                 if len(unique_sy) > 1:
                     self._msg_handler.raise_warn(
                         "Um valor nulo foi encontrado nas incertezas em y, removendo coluna de sy."
                     )
                 self._has_sy = False
-            unique_sx = df_json["sx"].astype(float).unique()
+            unique_sx = df["sx"].astype(float).unique()
             if 0.0 in unique_sx:
                 if len(unique_sx) > 1:
                     self._msg_handler.raise_warn(
                         "Um valor nulo foi encontrado nas incertezas em x, removendo coluna de sx."
                     )
                 self._has_sx = False
-            return df, df_json
+            return df
         else:
             self._msg_handler.raise_error(
                 "Há mais do que 4 colunas. Rever entrada de dados."
             )
-            return None, None
+            return None
 
-    def _load_by_data_path(self, data_path: str) -> None:
-        if data_path[-3:] == "csv":
-            self._read_csv(data_path)
+    def _load_by_data_path(
+        self, data_path: str, columns: list[int] | None = None
+    ) -> None:
+        if os.path.splitext(data_path)[1].lower() in self._binary_formats:
+            self._read_binary(data_path, columns)
+        elif data_path[-3:] == "csv":
+            self._read_csv(data_path, columns)
         else:
-            self._read_tsv_txt(data_path)
+            self._read_tsv_txt(data_path, columns)
 
-    def _fill_df_with_clipboardText(self, clipboardText):
+    def _read_binary(self, data_path: str, columns: list[int] | None = None) -> None:
+        """Leva as colunas float64 de arquivos binários direto ao store.
+
+        O .npy é mapeado em memória (copy-on-write, editar a tabela não altera
+        o arquivo) e os demais formatos leem só as colunas usadas. Os dados só
+        são lidos de fato quando a tabela ou o ajuste precisam deles. Com mais
+        de 4 colunas, pede a escolha e lê só as escolhidas.
+        """
+        self._df = None
+        suffix = os.path.splitext(data_path)[1].lower()
+        labels = None
         try:
-            df = (
-                pd.read_csv(
-                    StringIO(clipboardText),
-                    sep=r"\t|\s",
-                    header=None,
-                    engine="python",
-                    dtype=str,
+            if suffix == ".npy":
+                values = self._columns_of(np.load(data_path, mmap_mode="c"))
+            elif suffix == ".npz":
+                with np.load(data_path) as file:
+                    values = self._named_columns(file.files, file.__getitem__)
+                    if values is None:
+                        values = self._columns_of(file[file.files[0]])
+            elif suffix == ".parquet":
+                import pyarrow.parquet as pq
+
+                names = pq.ParquetFile(data_path).schema_arrow.names
+                values = self._named_columns(
+                    names,
+                    lambda name: pq.read_table(data_path, columns=[name])
+                    .column(0)
+                    .to_numpy(),
                 )
-                .dropna(how="all")
-                .replace(np.nan, "0")
+                if values is None and len(names) <= len(DataStore.columns):
+                    table = pq.read_table(data_path)
+                    values = self._columns_of(
+                        [table.column(i).to_numpy() for i in range(len(names))]
+                    )
+                elif values is None and columns is None:
+                    labels = [f"{i + 1}: {name}" for i, name in enumerate(names)]
+                elif values is None:
+                    table = pq.read_table(
+                        data_path, columns=[names[i] for i in set(columns) if i >= 0]
+                    )
+                    values = self._chosen_columns(
+                        columns, lambda i: table.column(names[i]).to_numpy()
+                    )
+            else:
+                values, labels = self._read_hdf5(data_path, columns)
+        except ImportError:
+            package = self._binary_formats[suffix]
+            self._msg_handler.raise_error(
+                f"Para abrir arquivos {suffix} é preciso instalar o pacote {package}."
+            )
+            return None
+        except (OSError, ValueError, KeyError, IndexError):
+            self._msg_handler.raise_error(
+                "Não foi possível ler o arquivo binário. Rever arquivo de entrada."
+            )
+            return None
+
+        if labels is not None:
+            self._ask_columns(data_path, labels)
+            return None
+        if (
+            values is not None
+            and len(values) > len(DataStore.columns)
+            and suffix in (".npy", ".npz")
+        ):
+            if columns is None:
+                self._ask_columns(
+                    data_path, [f"Coluna {i + 1}" for i in range(len(values))]
+                )
+                return None
+            values = self._map_columns(values, columns)
+        if values is None or len(values) > len(DataStore.columns):
+            self._msg_handler.raise_error(
+                "Há mais do que 4 colunas. Rever entrada de dados."
+            )
+            return None
+        self._has_sx = True
+        self._has_sy = True
+        self._set_store(DataStore(self._fill_columns(values)))
+        self.uploadData.emit(data_path.split("/")[-1])
+
+    def _read_hdf5(
+        self, data_path: str, columns: list[int] | None = None
+    ) -> tuple[np.ndarray | None, list[str] | None]:
+        """Colunas (k, n) do arquivo, ou os rótulos quando é preciso escolher."""
+        import h5py
+
+        with h5py.File(data_path, "r") as file:
+            names = [name for name in file if isinstance(file[name], h5py.Dataset)]
+            values = self._named_columns(names, lambda name: file[name][()])
+            if values is not None:
+                return values, None
+            dataset = file[names[0]]
+            if dataset.ndim == 1:
+                return self._columns_of(dataset[()]), None
+            if dataset.shape[1] > dataset.shape[0]:
+                count, read = dataset.shape[0], dataset.__getitem__
+            else:
+                count, read = dataset.shape[1], lambda i: dataset[:, i]
+            if count <= len(DataStore.columns):
+                return self._columns_of(dataset[()]), None
+            if columns is None:
+                return None, [f"Coluna {i + 1}" for i in range(count)]
+            return self._chosen_columns(columns, read), None
+
+    def _chosen_columns(self, columns: list[int], read) -> np.ndarray:
+        """Lê só as colunas escolhidas para x, y, sy e sx; -1 deixa a zerada."""
+        chosen = {
+            column: np.asarray(read(column), dtype=np.float64)
+            for column in set(columns)
+            if column >= 0
+        }
+        size = max((len(column) for column in chosen.values()), default=0)
+        mapped = np.zeros((len(DataStore.columns), size))
+        for i, column in enumerate(columns):
+            if column >= 0:
+                mapped[i] = chosen[column]
+        return mapped
+
+    def _columns_of(self, array) -> np.ndarray:
+        """Array (n, k), (k, n) ou (n,) como colunas (k, n) em float64.
+
+        Não copia quando o array já é float64.
+        """
+        if isinstance(array, list):
+            return np.stack([np.asarray(column, dtype=np.float64) for column in array])
+        names = array.dtype.names
+        if names is not None:
+            values = self._named_columns(names, array.__getitem__)
+            if values is None:
+                values = np.stack([array[name].astype(np.float64) for name in names])
+            return values
+        array = np.asarray(array, dtype=np.float64)
+        if array.ndim == 1:
+            return array[np.newaxis]
+        if array.shape[0] <= len(DataStore.columns) < array.shape[1]:
+            return array
+        return array.T
+
+    def _named_columns(self, names, read) -> np.ndarray | None:
+        """Lê só as colunas chamadas x, y, sy e sx, se houver x e y."""
+        if "x" not in names or "y" not in names:
+            return None
+        x = np.asarray(read("x"), dtype=np.float64)
+        values = np.zeros((len(DataStore.columns), len(x)))
+        values[0] = x
+        for i, name in enumerate(DataStore.columns[1:], start=1):
+            if name in names:
+                values[i] = read(name)
+        return values
+
+    def _fill_columns(self, values: np.ndarray) -> np.ndarray:
+        """Completa colunas (k, n) até x, y, sy e sx, como _to_check_columns."""
+        count = len(values)
+        if count == len(DataStore.columns):
+            return values
+        filled = np.zeros((len(DataStore.columns), values.shape[1]))
+        if count == 1:
+            filled[0] = np.arange(values.shape[1], dtype=float)
+            filled[1] = values[0]
+        else:
+            filled[:count] = values
+        return filled
+
+    def load_files(self, pattern: str) -> list[tuple[str, DataStore]]:
+        """Carrega em paralelo os arquivos de uma pasta ou de um padrão glob.
+
+        Cada arquivo passa pela leitura e checagem de load_data. Retorna o
+        nome e o store de cada arquivo lido; avisos e erros de todos chegam
+        numa única mensagem.
+        """
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        paths = sorted(
+            (
+                path
+                for path in glob.glob(pattern)
+                if os.path.splitext(path)[1].lower() in self._text_formats
+                and os.path.isfile(path)
+            ),
+            # run2 antes de run10
+            key=lambda path: [
+                int(part) if part.isdigit() else part
+                for part in re.split(r"(\d+)", path)
+            ],
+        )
+        if not paths:
+            self._msg_handler.raise_warn("Nenhum arquivo csv, txt ou tsv encontrado.")
+            return []
+        # O parser do pandas libera o GIL, os arquivos são lidos ao mesmo tempo
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(self._read_file, paths))
+
+        datasets, warnings, errors = [], [], []
+        for path, (store, messages) in zip(paths, results):
+            name = os.path.basename(path)
+            if store is None:
+                errors.append(f"{name}: {messages[-1]}")
+                continue
+            datasets.append((name, store))
+            warnings.extend(f"{name}: {message}" for message in messages)
+        if warnings:
+            self._msg_handler.raise_warn("\n".join(warnings))
+        if errors:
+            self._msg_handler.raise_error(
+                f"{len(errors)} arquivo(s) não carregado(s):\n" + "\n".join(errors)
+            )
+        return datasets
+
+    def read_numeric(self, data_path: str, warn=None) -> pd.DataFrame:
+        """Lê um arquivo csv, txt ou tsv com as mesmas regras de load_data."""
+        if data_path.lower().endswith(".csv"):
+            return self._parse_numeric(data_path, sep=",", warn=warn)
+        with open(data_path, encoding="utf-8") as file:
+            sample = file.read(self._sniff_size)
+        return self._parse_numeric(
+            data_path, sep=r"\s+", decimal=self._sniff_decimal(sample), warn=warn
+        )
+
+    def _read_file(self, data_path: str) -> tuple[DataStore | None, list[str]]:
+        """Lê um arquivo do lote sem mexer no estado do DataHandler.
+
+        Roda nas threads de load_files, então as mensagens são só guardadas.
+        """
+        messages = []
+        is_csv = data_path.lower().endswith(".csv")
+        try:
+            df = self.read_numeric(data_path, warn=messages.append)
+        except pd.errors.ParserError:
+            messages.append(
+                "Separação de colunas de arquivos csv são com vírgula (',')."
+                if is_csv
+                else "Separação de colunas de arquivos txt e tsv são com tab ou espaço."
+            )
+            return None, messages
+        except UnicodeDecodeError:
+            messages.append("O encoding do arquivo é inválido. Use o utf-8.")
+            return None, messages
+        except (OSError, ValueError):
+            messages.append("Não foi possível ler o arquivo.")
+            return None, messages
+        if df.empty:
+            messages.append("Não há dados numéricos no arquivo.")
+            return None, messages
+        if len(df.columns) > len(DataStore.columns):
+            messages.append("Há mais do que 4 colunas.")
+            return None, messages
+        values = np.ascontiguousarray(df.to_numpy().T)
+        return DataStore(self._fill_columns(values)), messages
+
+    def _fill_df_with_clipboardText(self, clipboardText):
+        try:
+            self._df = self._parse_numeric(
+                StringIO(clipboardText),
+                sep=r"\s+",
+                decimal=self._sniff_decimal(clipboardText[: self._sniff_size]),
             )
         except pd.errors.ParserError:
             self._msg_handler.raise_error(
                 "Separação de colunas de arquivos txt e tsv são com tab ou espaço. Rever dados de entrada."
             )
             return None
-        # Only consider number of columns less than 4
-        df = df.rename({0: "x", 1: "y", 2: "sy", 3: "sx"}, axis=1)
-        # Replacing all commas for dots
-        self._df = df
 
     def _filter_string_rows(self, df: pd.DataFrame) -> pd.DataFrame:
         cond = [
@@ -238,42 +683,54 @@ class DataHandler(QObject):
         clipboardText="",
     ) -> None:
         fileName = "Dados Carregados do Projeto"
+        self._set_source(None)
         if len(data_path) > 0:
             # Loading from .csv or (.txt and .tsv)
             data_path = QUrl(data_path).toLocalFile()
+            if os.path.splitext(data_path)[1].lower() in self._binary_formats:
+                # Já chega ao store em float64, sem passar por um DataFrame
+                self._read_binary(data_path)
+                return None
             self._load_by_data_path(data_path)
             fileName = data_path.split("/")[-1]
         elif df_array is not None:
             self._fill_df_with_array(df_array)
         elif clipboardText != "":
             self._fill_df_with_clipboardText(clipboardText)
+        self._load_df(fileName)
 
+    @pyqtSlot(str, list)
+    def load_data_columns(self, data_path: str, columns: list[int]) -> None:
+        """Carrega o arquivo lendo só as colunas escolhidas para x, y, sy e sx."""
+        data_path = QUrl(data_path).toLocalFile()
+        columns = [int(column) for column in columns]
+        self._set_source(None)
+        if os.path.splitext(data_path)[1].lower() in self._binary_formats:
+            self._read_binary(data_path, columns)
+            return None
+        self._load_by_data_path(data_path, columns)
+        self._load_df(data_path.split("/")[-1])
+
+    def _load_df(self, fileName: str) -> None:
         if isinstance(self._df, pd.DataFrame) and (self._df.empty is False):
-            self._df = self._comma_to_dot(self._df)
-            self._df = self._filter_string_rows(self._df)
-            self._df, self._data_json = self._to_check_columns(
-                self._df, self._data_json
-            )
+            if (self._df.dtypes != np.float64).any():
+                # Tabela e projeto ainda chegam como texto
+                self._df = self._comma_to_dot(self._df)
+                self._df = self._filter_string_rows(self._df)
+            self._df = self._to_check_columns(self._df)
             if self._df is None:
                 return None
             self._df = self._to_float(self._df)
-            self._data = deepcopy(self._df)
-            self._has_data = True
-            self.uploadData.emit(self._data_json.to_dict(orient="list"), fileName)
+            self._set_store(DataStore.from_frame(self._df))
+            self.uploadData.emit(fileName)
 
     @pyqtSlot(str)
     def _load_data_bottom(self, clipboardText_bottom) -> None:
         try:
-            df = (
-                pd.read_csv(
-                    StringIO(clipboardText_bottom),
-                    sep=r"\t|\s",
-                    engine="python",
-                    header=None,
-                    dtype=str,
-                )
-                .dropna(how="all")
-                .replace(np.nan, "0")
+            df = self._parse_numeric(
+                StringIO(clipboardText_bottom),
+                sep=r"\s+",
+                decimal=self._sniff_decimal(clipboardText_bottom[: self._sniff_size]),
             )
         except pd.errors.ParserError:
             self._msg_handler.raise_error(
@@ -281,60 +738,180 @@ class DataHandler(QObject):
             )
             return None
 
-        if isinstance(df, pd.DataFrame):
-            df = self._comma_to_dot(df)
-            if len(df.columns) > 1:
-                df = df.rename({0: "x", 1: "y", 2: "sy", 3: "sx"}, axis=1)
-                df = self._filter_string_rows(df)
-                self._df = pd.concat(
-                    [self._data_json, df], axis=0, ignore_index=True
-                ).fillna("0")
-                self._df, self._data_json = self._to_check_columns(
-                    self._df, self._data_json
-                )
-                if self._df is None:
-                    return None
-                self._df = self._to_float(self._df)
-            else:
-                self._msg_handler.raise_warn(
-                    "Para inserir novos dados, o número de colunas tem que ser maior do que 1."
+        if len(df.columns) > 1 and self.store is not None:
+            if len(df.columns) > 4:
+                self._msg_handler.raise_error(
+                    "Há mais do que 4 colunas. Rever entrada de dados."
                 )
+                self._df = None
+                return None
+            self._append_df(df)
+        elif len(df.columns) > 1:
+            self._df = self._to_check_columns(df)
+            if self._df is None:
+                return None
+            self._set_store(DataStore.from_frame(self._df))
+        else:
+            self._msg_handler.raise_warn(
+                "Para inserir novos dados, o número de colunas tem que ser maior do que 1."
+            )
+            if self.store is None:
+                return None
 
-            fileName = "Dados Carregados do Projeto"
-            self._data = deepcopy(self._df)
-            self._has_data = True
-            self.uploadData.emit(self._data_json.to_dict(orient="list"), fileName)
+        fileName = "Dados Carregados do Projeto"
+        self._has_data = True
+        self.uploadData.emit(fileName)
+
+    def _append_df(self, df: pd.DataFrame) -> None:
+        """Só as linhas novas são convertidas e checadas."""
+        values = np.zeros((len(DataStore.columns), len(df)))
+        values[: len(df.columns)] = df.to_numpy().T
+        self._table.append_rows(values)
+        self._check_uncertainties()
+        self._df = self.store.frame()
+
+    @pyqtSlot(bool)
+    def set_watch(self, watching: bool) -> None:
+        """Liga o acompanhamento do arquivo de texto carregado."""
+        self._watching = watching
+        if watching and self._watcher is None:
+            self._watcher = QFileSystemWatcher(self)
+            self._watcher.fileChanged.connect(self._file_changed)
+        if self._source is None:
+            return None
+        self._set_source(*self._source, offset=self._offset)
+        if watching:
+            # Linhas escritas desde o carregamento
+            self._watch_timer.start()
+
+    def _set_source(
+        self, data_path: str | None, options: dict = None, offset: int = None
+    ) -> None:
+        """Arquivo cujas linhas novas podem ser acrescentadas ao store.
+
+        Sem ``offset``, tudo o que o arquivo tem agora já foi lido.
+        """
+        if self._watcher is not None and self._watcher.files():
+            self._watcher.removePaths(self._watcher.files())
+        self._watch_timer.stop()
+        if data_path is None:
+            self._source = None
+            return None
+        self._source = (data_path, options)
+        self._offset = os.path.getsize(data_path) if offset is None else offset
+        if self._watching:
+            self._watcher.addPath(data_path)
+
+    @pyqtSlot(str)
+    def _file_changed(self, data_path: str) -> None:
+        # Vários avisos seguidos viram uma só leitura
+        if not self._watch_timer.isActive():
+            self._watch_timer.start()
+
+    def _read_appended(self) -> None:
+        """Lê só os bytes escritos depois da última leitura e os acrescenta.
+
+        Uma última linha ainda incompleta fica para a próxima leitura. Se o
+        arquivo diminuiu, ele foi reescrito e é carregado de novo.
+        """
+        if self._source is None or self.store is None:
+            return None
+        data_path, options = self._source
+        if not os.path.exists(data_path):
+            return None
+        if self._watching and data_path not in self._watcher.files():
+            # Programas que salvam trocando o arquivo tiram ele do watcher
+            self._watcher.addPath(data_path)
+        if os.path.getsize(data_path) < self._offset:
+            self._load_by_data_path(data_path, options["columns"])
+            self._load_df(data_path.split("/")[-1])
+            self.dataAppended.emit()
+            return None
+        with open(data_path, "rb") as file:
+            file.seek(self._offset)
+            new = file.read()
+        end = new.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self._offset += end
+        try:
+            df = self._parse_numeric(StringIO(new[:end].decode("utf-8")), **options)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError):
+            return None
+        if df.empty:
+            return None
+        if len(df.columns) == 1:
+            # Como no carregamento, a coluna única é y e x segue o índice
+            start = len(self.store)
+            df = pd.DataFrame(
+                {"x": np.arange(start, start + len(df), dtype=float), "y": df["x"]}
+            )
+        elif len(df.columns) > len(DataStore.columns):
+            self._msg_handler.raise_error(
+                "Há mais do que 4 colunas. Rever entrada de dados."
+            )
+            return None
+        self._append_df(df)
+        self.dataAppended.emit()
 
     @pyqtSlot(QJsonValue)
     def loadDataTable(
         self, data: list[list[str, str, str, str, bool]] | None = None
     ) -> None:
         """Getting data from table."""
+        self._set_source(None)
         self._df = pd.DataFrame.from_records(
             data, columns=["x", "y", "sy", "sx", "bool"]
         ).replace("", "0")
-        # Removing not chosen rows
-        self._df = self._df[self._df["bool"] == 1]
-        del self._df["bool"]
-        uniqueSi = self._df["sy"].astype(float).unique()
-        if 0.0 in uniqueSi:
-            if len(uniqueSi) > 1:
+        # Rows not chosen stay in the store, out of the mask
+        mask = (self._df.pop("bool") == 1).to_numpy()
+        # Turn everything into number (str -> number)
+        self._set_store(DataStore.from_frame(self._df.astype(float), mask))
+        self.load_table()
+
+    def load_table(self) -> None:
+        """Checa as incertezas das linhas marcadas na tabela antes do plot.
+
+        Se a tabela não mudou desde a última checagem, nada é refeito.
+        """
+        store = self.fit_store
+        checked_store, checked_version = self._checked
+        if store is not None and checked_store() is store:
+            if checked_version == store.version:
+                return None
+        self._has_sx = True
+        self._has_sy = True
+        if store is None:
+            self._has_data = False
+            return None
+        self._check_uncertainties()
+        self._has_data = True
+        self._checked = (weakref.ref(store), store.version)
+
+    def _check_uncertainties(self) -> None:
+        """Remove sy ou sx quando há zeros nas linhas marcadas.
+
+        Usa o estado de zeros do store, que um append atualiza olhando só as
+        linhas novas.
+        """
+        has_zero, has_nonzero = self.fit_store.zero_state()
+        if has_zero[2]:
+            if has_nonzero[2]:
                 self._msg_handler.raise_warn(
                     "Um valor nulo foi encontrado nas incertezas em y, removendo coluna de sy."
                 )
             self._has_sy = False
-        uniqueSi = self._df["sx"].astype(float).unique()  # TODO: Verificar check
-        if 0.0 in uniqueSi:
-            if len(uniqueSi) > 1:
+        if has_zero[3]:
+            if has_nonzero[3]:
                 self._msg_handler.raise_warn(
                     "Um valor nulo foi encontrado nas incertezas em x, removendo coluna de sx."
                 )
             self._has_sx = False
-        self._data_json = deepcopy(self._df)
 
-        # Turn everything into number (str -> number)
-        self._df = self._df.astype(float)
-        self._data = deepcopy(self._df)
+    def _set_store(self, store: DataStore) -> None:
+        """Troca os dados da tabela; _df passa a ser uma view do store."""
+        self._table.set_store(store)
+        self._df = store.frame()
         self._has_data = True
 
     @pyqtSlot()
@@ -353,21 +930,124 @@ class DataHandler(QObject):
         clipboardText_bottom = clipboard.mimeData().text()
         self._load_data_bottom(clipboardText_bottom)
 
+    @pyqtProperty(QObject, constant=True)
+    def table(self) -> DataTableModel:
+        return self._table
+
+    @property
+    def store(self) -> DataStore:
+        return self._table.store
+
     @property
     def data(self) -> pd.DataFrame:
-        return self._data
+        """Linhas marcadas na tabela, já transformadas."""
+        if self.fit_store is None:
+            return None
+        return self.fit_store.frame()
+
+    @property
+    def transforms(self) -> dict[str, str]:
+        """Expressões de x e y, como são salvas no projeto."""
+        return {column: t.expression for column, t in self._transforms.items()}
+
+    def set_transforms(self, expressions: dict[str, str] | None) -> bool:
+        """Troca as transformações de x e y; expressão vazia não transforma.
+
+        Só compila as expressões que mudaram. Devolve False, sem mudar nada,
+        se alguma delas é inválida.
+        """
+        transforms = {}
+        for column, expression in (expressions or {}).items():
+            if column not in self._transformable or not expression.strip():
+                continue
+            current = self._transforms.get(column)
+            if current is not None and current.expression == expression.strip():
+                transforms[column] = current
+                continue
+            try:
+                transforms[column] = ColumnTransform(expression)
+            except (SyntaxError, ValueError) as error:
+                reason = error.msg if isinstance(error, SyntaxError) else error
+                self._msg_handler.raise_error(
+                    f"Transformação de {column} inválida: {expression}\n{reason}"
+                )
+                return False
+        if transforms != self._transforms:
+            self._transforms = transforms
+            self._derived = (lambda: None, -1, -1, None, None)
+        return True
+
+    @property
+    def fit_store(self) -> DataStore:
+        """Store com as transformações aplicadas, ou o próprio store sem elas.
+
+        Só é recalculado quando os valores ou as transformações mudam; marcar
+        linhas só atualiza a máscara.
+        """
+        store = self.store
+        if store is None or not self._transforms:
+            return store
+        source, values_version, version, derived, valid = self._derived
+        if source() is not store or values_version != store.values_version:
+            transformed = self._transform(store)
+            if transformed is None:
+                # Falhou: os dados seguem sem transformação
+                self._transforms = {}
+                self._derived = (lambda: None, -1, -1, None, None)
+                return store
+            derived, valid = transformed
+        elif version != store.version:
+            derived.set_mask(store.mask & valid)
+        self._derived = (
+            weakref.ref(store),
+            store.values_version,
+            store.version,
+            derived,
+            valid,
+        )
+        return derived
+
+    def _transform(self, store: DataStore) -> tuple[DataStore, np.ndarray] | None:
+        """Aplica as transformações; linhas fora do domínio saem da máscara.
+
+        Devolve também as linhas dentro do domínio, ou None se a avaliação
+        falhou. O store de origem nunca é alterado.
+        """
+        values = store.values.copy()
+        # Cópias, não views: a expressão não alcança as colunas do store
+        columns = {column: np.array(store[column]) for column in self._transformable}
+        errors = {
+            column: np.array(store[error])
+            for column, error in self._transformable.items()
+        }
+        for column, transform in self._transforms.items():
+            rows = [
+                DataStore.columns.index(column),
+                DataStore.columns.index(self._transformable[column]),
+            ]
+            try:
+                values[rows] = transform.apply(columns, errors)
+            except Exception as error:
+                self._msg_handler.raise_error(
+                    f"Não foi possível aplicar a transformação de {column}: "
+                    f"{transform.expression}\n{error}"
+                )
+                return None
+        valid = np.isfinite(values).all(axis=0)
+        dropped = np.count_nonzero(store.mask & ~valid)
+        if dropped:
+            self._msg_handler.raise_warn(
+                f"{dropped} linha(s) fora do domínio da transformação foram ignoradas."
+            )
+        return DataStore(values, store.mask & valid), valid
 
     @property
     def separated_data(
         self,
     ) -> tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
         """Retorna x, y, sx e sy."""
-        return (
-            self._data["x"],
-            self._data["y"],
-            self._data["sy"],
-            self._data["sx"],
-        )
+        data = self.data
+        return (data["x"], data["y"], data["sy"], data["sx"])
 
     @property
     def has_sx(self) -> bool:
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+MIT License
+
+Copyright (c) 2021 Leonardo Eiji Tamayose, Guilherme Ferrari Fortino
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class DataStore:
+    """
+    Dados do singleplot em colunas float64 (x, y, sy e sx) e a máscara das
+    linhas escolhidas na tabela.
+
+    É a única cópia dos dados: o DataFrame entregue ao Model é uma view das
+    colunas e o texto mostrado na tabela só é gerado quando pedido.
+
+    Toda mudança passa pelos métodos abaixo e incrementa ``version``, assim
+    quem já leu os dados sabe quando pode reaproveitá-los. As colunas ficam
+    num buffer com folga que dobra de tamanho quando enche, então colar dados
+    no fim repetidas vezes custa só as linhas novas.
+    """
+
+    columns = ("x", "y", "sy", "sx")
+    # x_range ordena as posições só quando pegam menos que 1/8 das linhas
+    range_sort_fraction = 8
+
+    def __init__(self, values: np.ndarray, mask: np.ndarray | None = None) -> None:
+        # Uma linha por coluna; pode ser uma view de um arquivo mapeado
+        self._buffer = np.asarray(values, dtype=np.float64)
+        self._size = self._buffer.shape[1]
+        if mask is None:
+            mask = np.ones(self._size, dtype=bool)
+        self._mask_buffer = np.array(mask, dtype=bool)
+        self.version = 0
+        # Como version, mas só para mudanças nos valores, não na máscara
+        self.values_version = 0
+        # DataFrame das linhas marcadas e as linhas editadas desde então
+        self._frame: pd.DataFrame = None
+        self._frame_values: np.ndarray = None
+        self._frame_is_view = False
+        self._frame_version = -1
+        self._dirty: set[int] = set()
+        # Colunas com zeros e com valores não nulos, nas linhas marcadas
+        self._zero_state: tuple[np.ndarray, np.ndarray] = None
+        # Todas as linhas, sem cópia, até o buffer mudar
+        self._view: pd.DataFrame = None
+        # Ordem de x de todas as linhas e a values_version em que foi calculada
+        self._order: tuple[np.ndarray, np.ndarray] = None
+        self._order_version = -1
+        # A mesma ordem em posições de frame(), por version
+        self._checked_order: np.ndarray = None
+        self._checked_order_version = -1
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, mask: np.ndarray | None = None
+    ) -> DataStore:
+        return cls(df[list(cls.columns)].to_numpy(dtype=np.float64).T, mask)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._buffer[:, : self._size]
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self._mask_buffer[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.values[self.columns.index(column)]
+
+    @property
+    def nbytes(self) -> int:
+        return self._buffer.nbytes + self._mask_buffer.nbytes
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame das linhas marcadas, sem cópia quando todas estão.
+
+        Fica guardado até a próxima mudança. Se só algumas células mudaram, a
+        cópia filtrada recebe apenas essas linhas.
+        """
+        if self._frame_version == self.version:
+            return self._frame
+        if self._frame is None:
+            self._frame_is_view = bool(self.mask.all())
+            if self._frame_is_view:
+                self._frame_values = self.values
+            else:
+                self._frame_values = self.values[:, self.mask]
+            self._frame = pd.DataFrame(
+                self._frame_values.T, columns=list(self.columns), copy=False
+            )
+        elif not self._frame_is_view:
+            rows = np.fromiter(self._dirty, dtype=np.intp)
+            rows = rows[self.mask[rows]]
+            positions = np.cumsum(self.mask)[rows] - 1
+            self._frame_values[:, positions] = self.values[:, rows]
+        self._frame_version = self.version
+        self._dirty.clear()
+        return self._frame
+
+    def view(self) -> pd.DataFrame:
+        """DataFrame de todas as linhas, marcadas ou não, sem cópia.
+
+        Com ``mask`` e ``x_range`` é o que o ajuste usa: marcar linhas ou
+        mudar o intervalo não copia os dados.
+        """
+        if self._view is None:
+            self._view = pd.DataFrame(
+                self.values.T, columns=list(self.columns), copy=False
+            )
+        return self._view
+
+    def x_order(self) -> np.ndarray:
+        """Posições das linhas de ``frame()`` em ordem crescente de x.
+
+        Vem do argsort estável de todas as linhas, que só é refeito quando os
+        valores mudam; marcar linhas só filtra a ordem já calculada.
+        """
+        if self._checked_order_version != self.version:
+            order = self._sorted()[0]
+            if not self.mask.all():
+                order = order[self.mask[order]]
+                order = (np.cumsum(self.mask) - 1)[order]
+            self._checked_order = order
+            self._checked_order_version = self.version
+        return self._checked_order
+
+    def x_range(self, xmin: float, xmax: float) -> np.ndarray:
+        """Posições em ``view()`` das linhas com xmin <= x <= xmax, crescentes.
+
+        Marcadas ou não: quem usa combina com ``mask``. Duas buscas binárias
+        no x ordenado, sem percorrer todas as linhas. A janela que cobre todo
+        o x (o padrão, -inf a inf) nem ordena.
+        """
+        x = self["x"]
+        if self._order_version != self.values_version and (
+            len(x) == 0 or (xmin <= x.min() and x.max() <= xmax)
+        ):
+            return np.arange(len(x))
+        order, x = self._sorted()
+        start = np.searchsorted(x, xmin, side="left")
+        stop = np.searchsorted(x, xmax, side="right")
+        if start == 0 and stop == len(x):
+            return np.arange(len(x))
+        # Janelas largas: marcar e varrer é linear, ordenar as posições não
+        if stop - start > len(x) // self.range_sort_fraction:
+            inside = np.zeros(len(x), dtype=bool)
+            inside[order[start:stop]] = True
+            return np.flatnonzero(inside)
+        return np.sort(order[start:stop])
+
+    def _sorted(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._order_version != self.values_version:
+            x = self["x"]
+            order = np.argsort(x, kind="stable")
+            self._order = (order, x[order])
+            self._order_version = self.values_version
+        return self._order
+
+    def _changed(self, row: int | None = None, values: bool = True) -> None:
+        """Nova versão; ``row`` é a única linha alterada, sem mudar a máscara.
+
+        ``values`` False: só a máscara mudou.
+        """
+        self.version += 1
+        self._zero_state = None
+        if values:
+            self.values_version += 1
+        if row is None:
+            if values:
+                self._view = None
+            self._frame = None
+            self._dirty.clear()
+        elif self._frame is not None:
+            self._dirty.add(row)
+
+    def set_value(self, row: int, column: int, value: float) -> None:
+        self.values[column, row] = value
+        self._changed(row)
+
+    def set_checked(self, row: int, checked: bool) -> None:
+        if self.mask[row] != checked:
+            self.mask[row] = checked
+            self._changed(values=False)
+
+    def set_mask(self, mask: np.ndarray) -> None:
+        """Troca a máscara inteira, no buffer que já existe."""
+        self.mask[:] = mask
+        self._changed(values=False)
+
+    def touch(self) -> None:
+        """Avisa que ``values`` foi alterado inteiro, no lugar."""
+        self._changed()
+
+    def zero_state(self) -> tuple[np.ndarray, np.ndarray]:
+        """Para cada coluna, se as linhas marcadas têm zeros e não nulos."""
+        if self._zero_state is None:
+            zeros = self.values[:, self.mask] == 0.0
+            self._zero_state = (zeros.any(axis=1), (~zeros).any(axis=1))
+        return self._zero_state
+
+    def format_value(self, row: int, column: int) -> str:
+        """Texto de uma célula, gerado só quando a tabela pede."""
+        return f"{self.values[column, row]:.15g}"
+
+    def append(self, values: np.ndarray, mask: np.ndarray | None = None) -> None:
+        """Acrescenta colunas (4, k) ao fim dos dados, sem copiar as antigas."""
+        values = np.asarray(values, dtype=np.float64).reshape(len(self.columns), -1)
+        if mask is None:
+            mask = np.ones(values.shape[1], dtype=bool)
+        size = self._size + values.shape[1]
+        if size > self._buffer.shape[1]:
+            self._grow(max(size, 2 * self._buffer.shape[1]))
+        self._buffer[:, self._size : size] = values
+        self._mask_buffer[self._size : size] = mask
+
+        # Só as linhas novas atualizam o estado dos zeros
+        zero_state = self._zero_state
+        if zero_state is not None:
+            zeros = values[:, mask] == 0.0
+            zero_state = (
+                zero_state[0] | zeros.any(axis=1),
+                zero_state[1] | (~zeros).any(axis=1),
+            )
+        self._size = size
+        self._changed()
+        self._zero_state = zero_state
+
+    def _grow(self, capacity: int) -> None:
+        buffer = np.empty((len(self.columns), capacity), dtype=np.float64)
+        buffer[:, : self._size] = self.values
+        mask = np.zeros(capacity, dtype=bool)
+        mask[: self._size] = self.mask
+        self._buffer, self._mask_buffer = buffer, mask
+
+    def remove(self, row: int) -> None:
+        # Buffer novo: quem tem uma view das linhas antigas não as vê mudar
+        self._buffer = np.delete(self.values, row, axis=1)
+        self._mask_buffer = np.delete(self.mask, row)
+        self._size -= 1
+        self._changed()
+
+    def to_records(self) -> list[list]:
+        """Linhas [x, y, sy, sx, marcada] como são salvas no projeto."""
+        return [
+            [f"{value:.15g}" for value in row] + [int(checked)]
+            for row, checked in zip(self.values.T.tolist(), self.mask.tolist())
+        ]
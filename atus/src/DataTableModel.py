@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+MIT License
+
+Copyright (c) 2021 Leonardo Eiji Tamayose, Guilherme Ferrari Fortino
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import numpy as np
+from PyQt5.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    Qt,
+    QVariant,
+    pyqtProperty,
+    pyqtSignal,
+    pyqtSlot,
+)
+from .DataStore import DataStore
+from .MessageHandler import MessageHandler
+
+
+class DataTableModel(QAbstractTableModel):
+    """
+    Tabela de dados do singleplot, lida direto do DataStore.
+
+    A QML pede só as células das linhas visíveis e cada edição chega como uma
+    mudança de célula ou de linha, sem reenviar a tabela inteira.
+    """
+
+    countChanged = pyqtSignal()
+
+    XRole = Qt.UserRole + 1
+    YRole = Qt.UserRole + 2
+    SyRole = Qt.UserRole + 3
+    SxRole = Qt.UserRole + 4
+    CheckedRole = Qt.UserRole + 5
+
+    _value_roles = {XRole: 0, YRole: 1, SyRole: 2, SxRole: 3}
+    _columns = {"x": 0, "y": 1, "sy": 2, "sx": 3}
+
+    def __init__(self, messageHandler: MessageHandler, parent=None) -> None:
+        super().__init__(parent)
+        self._msg_handler = messageHandler
+        self._store: DataStore = None
+
+    @property
+    def store(self) -> DataStore:
+        return self._store
+
+    def set_store(self, store: DataStore | None) -> None:
+        self.beginResetModel()
+        self._store = store
+        self.endResetModel()
+        self.countChanged.emit()
+
+    @pyqtProperty(int, notify=countChanged)
+    def count(self) -> int:
+        return self.rowCount()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self._store is None:
+            return 0
+        return len(self._store)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(DataStore.columns) + 1
+
+    def roleNames(self) -> dict[int, bytes]:
+        return {
+            Qt.DisplayRole: b"display",
+            self.XRole: b"x_v",
+            self.YRole: b"y_v",
+            self.SyRole: b"sy",
+            self.SxRole: b"sx",
+            self.CheckedRole: b"isChecked",
+        }
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or self._store is None:
+            return QVariant()
+        row = index.row()
+        if role == Qt.DisplayRole:
+            column = index.column()
+        elif role in self._value_roles:
+            column = self._value_roles[role]
+        elif role == self.CheckedRole:
+            column = len(DataStore.columns)
+        else:
+            return QVariant()
+        if column == len(DataStore.columns):
+            return bool(self._store.mask[row])
+        return self._store.format_value(row, column)
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if not index.isValid() or self._store is None:
+            return False
+        if index.column() == len(DataStore.columns) or role == self.CheckedRole:
+            return self.set_checked(index.row(), bool(value))
+        return self.set_value(index.row(), index.column(), str(value))
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def _row_changed(self, row: int) -> None:
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(DataStore.columns))
+        )
+
+    @pyqtSlot(int, int, str, result=bool)
+    def set_value(self, row: int, column: int, text: str) -> bool:
+        try:
+            value = float(text.replace(",", "."))
+        except ValueError:
+            return False
+        self._store.set_value(row, column, value)
+        self._row_changed(row)
+        return True
+
+    @pyqtSlot(int, bool, result=bool)
+    def set_checked(self, row: int, checked: bool) -> bool:
+        self._store.set_checked(row, checked)
+        self._row_changed(row)
+        return True
+
+    @pyqtSlot(int)
+    def add_rows(self, number: int) -> None:
+        """Acrescenta linhas zeradas no fim da tabela."""
+        if number > 0:
+            self.append_rows(np.zeros((len(DataStore.columns), number)))
+
+    def append_rows(self, values: np.ndarray) -> None:
+        """Acrescenta as colunas (4, k) no fim da tabela."""
+        start = self.rowCount()
+        self.beginInsertRows(QModelIndex(), start, start + values.shape[1] - 1)
+        if self._store is None:
+            self._store = DataStore(values)
+        else:
+            self._store.append(values)
+        self.endInsertRows()
+        self.countChanged.emit()
+
+    @pyqtSlot(int)
+    def remove_row(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._store.remove(row)
+        self.endRemoveRows()
+        self.countChanged.emit()
+
+    @pyqtSlot()
+    def clear(self) -> None:
+        self.set_store(None)
+
+    @pyqtSlot(str, str, str, str)
+    def apply_operation(
+        self, operation: str, column1: str, column2: str, value: str
+    ) -> None:
+        """Operações do popup de edição, aplicadas à coluna inteira."""
+        try:
+            value = float(value.replace(",", "."))
+        except ValueError:
+            self._msg_handler.raise_warn("Valor inválido. Rever valor da operação.")
+            return None
+        if operation == "Adicionar linhas":
+            self.add_rows(int(value))
+            return None
+        if self._store is None or len(self._store) == 0:
+            return None
+
+        values = self._store.values
+        first = self._columns[column1]
+        if operation == "Trocar":
+            second = self._columns[column2]
+            values[[first, second]] = values[[second, first]]
+        elif operation == "Somar":
+            values[first] += value
+        elif operation == "Subtrair":
+            values[first] -= value
+        elif operation == "Multiplicar":
+            values[first] *= value
+        elif operation == "Dividir":
+            values[first] /= value
+        elif operation == "Substituir":
+            values[first] = value
+        self._store.touch()
+        self.dataChanged.emit(
+            self.index(0, 0),
+            self.index(self.rowCount() - 1, len(DataStore.columns)),
+        )
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+MIT License
+
+Copyright (c) 2021 Leonardo Eiji Tamayose, Guilherme Ferrari Fortino
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+import numpy as np
+from matplotlib import colors
+from matplotlib.image import AxesImage
+
+
+class DensityImage(AxesImage):
+    """
+    Draws a large set of points as an image with the number of points in
+    each pixel of the axes, instead of one marker per point.
+
+    The counts are recomputed only when the view or the axes size changes,
+    and the points are kept sorted by x so the visible range is found with a
+    binary search. ``order`` is the argsort of x when the caller already has
+    it, as a DataStore does.
+    """
+
+    def __init__(self, ax, x, y, color, order=None, **kwargs):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if order is None:
+            order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+        finite = np.isfinite(x) & np.isfinite(y)
+        self.x = x[finite]
+        self.y = y[finite]
+
+        # From a light version of the color, for few points, to the color
+        alpha = colors.to_rgba(color)[3]
+        cmap = colors.LinearSegmentedColormap.from_list(
+            "density",
+            [colors.to_rgba(color, 0.35 * alpha), colors.to_rgba(color, alpha)],
+        )
+        cmap.set_bad((0, 0, 0, 0))
+        super().__init__(
+            ax,
+            cmap=cmap,
+            norm=colors.LogNorm(vmin=1, vmax=2),
+            interpolation="nearest",
+            origin="lower",
+            extent=(0, 1, 0, 1),
+            transform=ax.transAxes,
+            **kwargs
+        )
+        self._view = None
+        self.set_data(np.ma.masked_all((1, 1)))
+
+    @property
+    def bounds(self):
+        """Corners of the data, (xmin, ymin), (xmax, ymax)."""
+        if self.x.size == 0:
+            return (0, 0), (1, 1)
+        return (self.x[0], self.y.min()), (self.x[-1], self.y.max())
+
+    def aggregate(self):
+        """Count the visible points in a grid with one cell per pixel."""
+        ax = self.axes
+        nx = max(int(ax.bbox.width), 1)
+        ny = max(int(ax.bbox.height), 1)
+        (x0, x1), (y0, y1) = sorted(ax.get_xlim()), sorted(ax.get_ylim())
+        view = (x0, x1, y0, y1, nx, ny, ax.get_xscale(), ax.get_yscale())
+        if view == self._view:
+            return
+        self._view = view
+
+        i0 = np.searchsorted(self.x, x0, side="left")
+        i1 = np.searchsorted(self.x, x1, side="right")
+        x, y = self.x[i0:i1], self.y[i0:i1]
+        keep = (y >= y0) & (y <= y1)
+        x, y = x[keep], y[keep]
+
+        # Binning in the scale space makes log axes work as linear ones
+        xscale = ax.xaxis.get_transform()
+        yscale = ax.yaxis.get_transform()
+        fx0, fx1 = xscale.transform(np.array([x0, x1]))
+        fy0, fy1 = yscale.transform(np.array([y0, y1]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fx, fy = xscale.transform(x), yscale.transform(y)
+        # Non-positive values on a log axis have no position, nan is no bin
+        finite = np.isfinite(fx) & np.isfinite(fy)
+        if not finite.all():
+            fx, fy = fx[finite], fy[finite]
+        ix = (fx - fx0) * (nx / (fx1 - fx0))
+        iy = (fy - fy0) * (ny / (fy1 - fy0))
+        ix = np.clip(ix.astype(np.intp), 0, nx - 1)
+        iy = np.clip(iy.astype(np.intp), 0, ny - 1)
+        counts = np.bincount(iy * nx + ix, minlength=nx * ny).reshape(ny, nx)
+
+        self.norm.vmax = max(counts.max(initial=0), 2)
+        self.set_data(np.ma.masked_equal(counts, 0))
+
+    def draw(self, renderer, *args, **kwargs):
+        self.aggregate()
+        super().draw(renderer, *args, **kwargs)
+
+
+def density_plot(ax, x, y, color, label=None, zorder=2, order=None):
+    """Add a DensityImage of the points to the axes and return it."""
+    image = DensityImage(ax, x, y, color, order=order, zorder=zorder)
+    ax.add_image(image)
+    ax.update_datalim(image.bounds)
+    ax.autoscale_view()
+    if label:
+        # Images have no legend handle, a marker without data stands for it
+        ax.plot([], [], "s", color=color, label=label)
+    return image
@@ -30,7 +30,9 @@ import pandas as pd
 import numpy as np
 import platform
 import json
+import os
 from io import StringIO
+from .DataHandler import DataHandler
 
 
 class Histogram(QObject):
@@ -39,10 +41,11 @@ class Histogram(QObject):
     # Signals
     fillPage = pyqtSignal(QJsonValue)
 
-    def __init__(self, canvas, messageHandler) -> None:
+    def __init__(self, canvas, messageHandler, datahandler) -> None:
         super().__init__()
         self.messageHandler = messageHandler
         self.canvas = canvas
+        self.datahandler: DataHandler = datahandler
         self.path = ""
         self.histAlign = {
             "Centro": "mid",
@@ -407,56 +410,42 @@ class Histogram(QObject):
         Returns: True + Data if valid data, False otherwise
         """
         package = {"isValid": False, "data": None}
-        # Loading from .csv or (.txt and .tsv)
+        # Loading from .csv or (.txt and .tsv), as regras e o cache do singleplot
         filePath = QUrl(filePath).toLocalFile()
-        if filePath[-3:] == "csv":
-            try:
-                df = pd.read_csv(filePath, sep=",", header=None, dtype=str).replace(
-                    np.nan, "0"
-                )
-            except pd.errors.ParserError:
+        if os.path.splitext(filePath)[1].lower() not in DataHandler._text_formats:
+            self.messageHandler.raise_error(
+                "Apenas arquivos .txt, .csv, .tsv são suportados."
+            )
+            return QJsonValue.fromVariant(package)
+        try:
+            df = self.datahandler.read_numeric(filePath)
+        except pd.errors.ParserError:
+            if filePath[-3:] == "csv":
                 self.messageHandler.raise_error(
                     "Separação de colunas de arquivos csv são com vírgula. Rever dados de entrada.",
                 )
-                # Separação de colunas de arquivos csv são com vírgula (","). Rever dados de entrada.
-                return QJsonValue.fromVariant(package)
-        elif filePath[-3:] == "tsv" or filePath[-3:] == "txt":
-            try:
-                df = pd.read_csv(filePath, sep="\t", header=None, dtype=str).replace(
-                    np.nan, "0"
-                )
-            except pd.errors.ParserError:
+            else:
                 self.messageHandler.raise_error(
-                    "Separação de colunas de arquivos txt e tsv são com tab. Rever dados de entrada."
+                    "Separação de colunas de arquivos txt e tsv são com tab ou espaço. Rever dados de entrada."
                 )
-                # Separação de colunas de arquivos txt e tsv são com tab. Rever dados de entrada.
-                return QJsonValue.fromVariant(package)
-        else:
+            return QJsonValue.fromVariant(package)
+        except UnicodeDecodeError:
             self.messageHandler.raise_error(
-                "Apenas arquivos .txt, .csv, .tsv são suportados."
+                "O encoding do arquivo é inválido. Use o utf-8."
             )
             return QJsonValue.fromVariant(package)
 
-        if len(df.columns) == 1:
-            df.columns = ["x"]
-        else:
+        if len(df.columns) != 1:
             self.messageHandler.raise_error(
                 "A tabela de histogramas deve conter no máximo 1 coluna."
             )
             return QJsonValue.fromVariant(package)
-
-        for i in df.columns:
-            # Replacing comma for dots
-            df[i] = [x.replace(",", ".") for x in df[i]]
-            # Converting everything to float
-            try:
-                df[i] = df[i].astype(float)
-            except ValueError:
-                self.messageHandler.raise_error(
-                    "A entrada de dados só permite entrada de números. Rever arquivo de entrada."
-                )
-                # Há células não numéricas. A entrada de dados só permite entrada de números. Rever arquivo de entrada.
-                return QJsonValue.fromVariant(package)
+        if df.empty:
+            self.messageHandler.raise_error(
+                "A entrada de dados só permite entrada de números. Rever arquivo de entrada."
+            )
+            return QJsonValue.fromVariant(package)
+        df.columns = ["x"]
 
         package["data"] = df.to_json()
         package["isValid"] = True
@@ -22,24 +22,105 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import io
 import os
+import pickle
+from collections import OrderedDict
 
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib import gridspec
+from matplotlib import colors, gridspec
+from matplotlib.backend_bases import _Mode
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib_backend_qtquick_2.backend_qtquick import (
     NavigationToolbar2QtQuick,
 )
-from PyQt5.QtCore import QObject, QUrl, pyqtProperty, pyqtSignal, pyqtSlot
-from PyQt5.QtGui import QGuiApplication, QPixmap
+from PyQt5.QtCore import (
+    QCoreApplication,
+    QObject,
+    QThread,
+    QTimer,
+    QUrl,
+    pyqtProperty,
+    pyqtSignal,
+    pyqtSlot,
+)
+from PyQt5.QtGui import QGuiApplication, QImage
+from .DensityPlot import density_plot
 from .MessageHandler import MessageHandler
 
 
+class ExportCancelled(Exception):
+    """Raised inside savefig to stop an export."""
+
+
+class FigureExporter(QObject):
+    """Saves copies of a figure, meant to live in its own thread."""
+
+    progress = pyqtSignal(float)
+    finished = pyqtSignal(str, bool)
+
+    def __init__(self):
+        super().__init__()
+        self.cancel_requested = False
+
+    @pyqtSlot(bytes, list, int, bool)
+    def export(self, snapshot, paths, dpi, transparent):
+        """Save the pickled figure in every path, one format for each."""
+        try:
+            figure = pickle.loads(snapshot)
+        except Exception as error:
+            self.finished.emit(f"Erro ao salvar a imagem.\n{error}", False)
+            return
+        FigureCanvasAgg(figure)
+        # The layout is fixed by subplots_adjust, so every format reuses it
+        steps = len(paths) * max(len(figure.axes), 1)
+        done = 0
+
+        def cancellable(draw):
+            def wrapper(renderer):
+                nonlocal done
+                if self.cancel_requested:
+                    raise ExportCancelled
+                draw(renderer)
+                done += 1
+                self.progress.emit(min(done / steps, 1.0))
+
+            return wrapper
+
+        for ax in figure.axes:
+            ax.draw = cancellable(ax.draw)
+
+        for path in paths:
+            try:
+                figure.savefig(path, dpi=dpi, transparent=transparent)
+            except ExportCancelled:
+                if os.path.exists(path):
+                    os.remove(path)
+                self.finished.emit("Exportação cancelada.", False)
+                return
+            except Exception as error:
+                self.finished.emit(f"Erro ao salvar a imagem.\n{error}", False)
+                return
+        self.progress.emit(1.0)
+        if len(paths) > 1:
+            self.finished.emit("Imagens salvas com sucesso!", True)
+        else:
+            self.finished.emit("Imagem salva com sucesso!", True)
+
+
 class Canvas(QObject):
     """TODO"""
 
     # Some signals for the frontend
     coordinates_changed = pyqtSignal(str)
+    frame_stats_changed = pyqtSignal()
+    export_progress_changed = pyqtSignal()
+    exporting_changed = pyqtSignal()
+    start_export = pyqtSignal(bytes, list, int, bool)
+    # Página cuja figura acabou de entrar no canvas
+    page_activated = pyqtSignal(int)
 
     def __init__(self, message_handler: MessageHandler):
         super().__init__()
@@ -75,6 +156,10 @@ class Canvas(QObject):
         }
         self.legend_loc = "best"
         self.dpi = 500
+        self.clipboard_scale = 1.0
+        # Above density_threshold points, scatter plots become density images
+        self.density_mode = False
+        self.density_threshold = 500_000
         self.font_sizes = {
             "titulo": 12,
             "residuos": 12,
@@ -86,12 +171,57 @@ class Canvas(QObject):
         self.user_color_outliers = None
         # This is used to display the coordinates of the mouse in the window
         self._coordinates = ""
+        self._pending_coordinates = ""
+        self.coordinates_timer = QTimer()
+        self.coordinates_timer.setSingleShot(True)
+        self.coordinates_timer.setInterval(50)
+        self.coordinates_timer.timeout.connect(self._show_coordinates)
+        # Artists redrawn over the cached background while panning
+        self.animated_artists = []
+        # Figures are exported in another thread, so the interface keeps working
+        self._export_progress = 0.0
+        self._exporting = False
+        # The thread only starts with the first export and stops with the app
+        self.exporter_thread = QThread()
+        self.exporter = FigureExporter()
+        self.exporter.moveToThread(self.exporter_thread)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_exporter)
+        self.exporter.progress.connect(self._on_export_progress)
+        self.exporter.finished.connect(self._on_export_finished)
+        self.start_export.connect(self.exporter.export)
+        # Figure state of the inactive pages, least recently used first
+        self.page = None
+        self._pages = OrderedDict()
+        self.max_cached_pages = 2
+        self._page_attrs = (
+            "figure",
+            "toolbar",
+            "gm",
+            "gs",
+            "axes1",
+            "axes2",
+            "oid",
+            "cid",
+            "grid",
+            "figmode",
+            "animated_artists",
+        )
 
     def update_with_canvas(self, canvas):
         """Initialize with the canvas for the figure."""
         self.canvas = canvas
-        self.figure = self.canvas.figure
-        self.toolbar = NavigationToolbar2QtQuick(canvas=canvas)
+        self.canvas.frameProfiled.connect(self.frame_stats_changed)
+        self.setup_figure(self.canvas.figure)
+        self.canvas.draw_idle()
+
+    def setup_figure(self, figure):
+        """Create the axes and the toolbar of a new figure on the canvas."""
+        if self.canvas.figure is not figure:
+            self.canvas.set_figure(figure)
+        self.figure = figure
+        self.toolbar = NavigationToolbar2QtQuick(canvas=self.canvas)
         self.gm = gridspec.GridSpec(2, 1, figure=self.figure, height_ratios=[3.0, 1.0])
         self.gs = gridspec.GridSpec(1, 1, figure=self.figure, height_ratios=[1.0])
         self.axes1 = self.figure.add_subplot(self.gm[0], picker=True, autoscale_on=True)
@@ -104,10 +234,66 @@ class Canvas(QObject):
             self.gs[:, :].get_position(self.figure), which="original"
         )
         self.axes1.grid(False)
-        self.canvas.draw_idle()
+        self.oid = 0
+        self.cid = 0
+        self.grid = False
+        self.figmode = 0
+        self.animated_artists = []
 
         # Connect for displaying the coordinates
         self.figure.canvas.mpl_connect("motion_notify_event", self.on_motion)
+        # Connect after the toolbar, so the pan is already started on press
+        self.figure.canvas.mpl_connect("button_press_event", self.on_press)
+        self.figure.canvas.mpl_connect("button_release_event", self.on_release)
+
+    @pyqtSlot(int)
+    def activate_page(self, page):
+        """
+        Mostra a figura da página, criando uma se ela não estiver em cache.
+        As figuras das páginas inativas são liberadas da menos usada para a
+        mais usada quando passam de max_cached_pages.
+        """
+        if page == self.page or self.canvas is None:
+            return
+        if self.page is None:
+            # The first page keeps the figure created with the canvas
+            self.page = page
+            self.page_activated.emit(page)
+            return
+        # Release the pan/zoom lock of the canvas before switching toolbars
+        mode = self.toolbar.mode
+        self._set_toolbar_mode(self.toolbar, _Mode.NONE)
+        self._pages[self.page] = {
+            attr: getattr(self, attr) for attr in self._page_attrs
+        }
+        self.page = page
+        state = self._pages.pop(page, None)
+        if state is None:
+            self.setup_figure(Figure())
+        else:
+            self.canvas.set_figure(state["figure"])
+            self.canvas.toolbar = state["toolbar"]
+            for attr, value in state.items():
+                setattr(self, attr, value)
+        self._set_toolbar_mode(self.toolbar, mode)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        self.canvas.draw_idle()
+        self.page_activated.emit(page)
+
+    def _set_toolbar_mode(self, toolbar, mode):
+        """Keep the pan/zoom mode selected in the interface."""
+        if toolbar.mode == mode:
+            return
+        # pan() and zoom() toggle the mode
+        if toolbar.mode == _Mode.PAN:
+            toolbar.pan()
+        elif toolbar.mode == _Mode.ZOOM:
+            toolbar.zoom()
+        if mode == _Mode.PAN:
+            toolbar.pan()
+        elif mode == _Mode.ZOOM:
+            toolbar.zoom()
 
     def clear_axis(self):
         """Clear the current plot in the axis."""
@@ -117,8 +303,13 @@ class Canvas(QObject):
         self.axes2.relim()
         self.axes1.remove_callback(self.oid)
         self.axes1.figure.canvas.mpl_disconnect(self.cid)
+        self.animated_artists = []
         self.canvas.draw_idle()
 
+    def add_animated_artist(self, artist):
+        """Register an artist that moves with the view, like a fit curve."""
+        self.animated_artists.append(artist)
+
     def switch_axes(self, hide_axes2: bool = True):
         """Função que oculta ou não o eixo secundário."""
         if hide_axes2:
@@ -240,16 +431,55 @@ class Canvas(QObject):
 
     def plot_error_bar_new(self, x, y, sy, sx, kargs_errorbar, y_r=None, ssy=None):
         """Faz o plot das barras de erro."""
+        if self.use_density(len(x)):
+            # Error bars of so many points would only hide the density
+            return
         self.axes1.errorbar(x, y, yerr=sy, xerr=sx, ms=0, **kargs_errorbar)
         if y_r is not None:
             self.axes2.errorbar(x, y_r, yerr=ssy, ms=0, **kargs_errorbar)
 
     def plot_scatter(self, x, y, kargs_scatter, y_r=None):
-        """Faz o plot dos pontos."""
+        """Faz o plot dos pontos.
+
+        Na densidade, ``c`` é uma cor ou uma por ponto; cada cor diferente
+        (como a dos outliers, mais transparente) vira uma imagem própria.
+        """
+        if self.use_density(len(x)):
+            rgba = colors.to_rgba_array(kargs_scatter.get("c", "C0"))
+            if len(rgba) == 1:
+                self.plot_density(x, y, rgba[0], y_r=y_r)
+                return
+            if len(rgba) != len(x):
+                raise ValueError("c precisa ter uma cor ou uma cor por ponto.")
+            x, y = np.asarray(x), np.asarray(y)
+            palette, groups = np.unique(rgba, axis=0, return_inverse=True)
+            for i, color in enumerate(palette):
+                rows = np.flatnonzero(groups.ravel() == i)
+                y_rows = None if y_r is None else np.asarray(y_r)[rows]
+                self.plot_density(x[rows], y[rows], color, y_r=y_rows)
+            return
         self.axes1.scatter(x, y, **kargs_scatter)
         if y_r is not None:
             self.axes2.scatter(x, y_r, **kargs_scatter)
 
+    def use_density(self, n_points):
+        """Se os pontos devem ser desenhados como uma imagem de densidade."""
+        return self.density_mode or n_points >= self.density_threshold
+
+    def plot_density(self, x, y, color, label=None, y_r=None, order=None):
+        """Faz o plot dos pontos como contagens por pixel.
+
+        ``order`` é o argsort de x, se já for conhecido.
+        """
+        density_plot(self.axes1, x, y, color, label=label, order=order)
+        if y_r is not None:
+            density_plot(self.axes2, x, y_r, color, order=order)
+
+    @pyqtSlot(bool)
+    def set_density_mode(self, enabled):
+        """Força o modo de densidade mesmo com poucos pontos."""
+        self.density_mode = enabled
+
     def set_tight_layout(self):
         self.figure.subplots_adjust(
             left=self.left, bottom=self.bottom, right=self.right, top=self.top
@@ -314,14 +544,69 @@ class Canvas(QObject):
         # Getting extension
         _, extension = os.path.splitext(path)  # Recebe filename e extension
 
-        if transparent and extension != "png":
+        if transparent and extension.lower() != ".png":
             self.message_handler.raise_warn(
                 "O fundo transparente funciona apenas na extensão .png"
             )
-            self.canvas.figure.savefig(path, dpi=self.dpi, transparent=transparent)
-        else:
-            self.canvas.figure.savefig(path, dpi=self.dpi, transparent=transparent)
+        self.export_figure([path], transparent)
+
+    @pyqtSlot(str, bool, list)
+    def save_plot_formats(self, save_path, transparent, formats):
+        """Salva a figura em vários formatos com o mesmo nome."""
+        root, _ = os.path.splitext(QUrl(save_path).toLocalFile())
+        self.export_figure([f"{root}.{fmt}" for fmt in formats], transparent)
+
+    def export_figure(self, paths, transparent):
+        """Exporta uma cópia da figura em segundo plano."""
+        if self._exporting:
+            self.message_handler.raise_warn("Já existe uma exportação em andamento.")
+            return
+        try:
+            snapshot = pickle.dumps(self.canvas.figure)
+        except Exception:
+            # Figures that can not be copied are saved right away
+            for path in paths:
+                self.canvas.figure.savefig(path, dpi=self.dpi, transparent=transparent)
             self.message_handler.raise_success("Imagem salva com sucesso!")
+            return
+        self.exporter.cancel_requested = False
+        if not self.exporter_thread.isRunning():
+            self.exporter_thread.start()
+        self._set_exporting(True)
+        self._on_export_progress(0.0)
+        self.start_export.emit(snapshot, paths, self.dpi, transparent)
+
+    @pyqtSlot()
+    def stop_exporter(self):
+        """Encerra a thread de exportação, esperando a exportação em curso."""
+        self.exporter.cancel_requested = True
+        self.exporter_thread.quit()
+        self.exporter_thread.wait()
+
+    @pyqtSlot()
+    def cancel_export(self):
+        self.exporter.cancel_requested = True
+
+    def _on_export_progress(self, progress):
+        self._export_progress = progress
+        self.export_progress_changed.emit()
+
+    def _on_export_finished(self, message, success):
+        self._set_exporting(False)
+        if success:
+            self.message_handler.raise_success(message)
+        else:
+            self.message_handler.raise_warn(message)
+
+    def _set_exporting(self, exporting):
+        self._exporting = exporting
+        self.exporting_changed.emit()
+
+    def get_export_progress(self):
+        return self._export_progress
+
+    def get_exporting(self):
+        return self._exporting
 
     @pyqtSlot()
     def copy_to_clipboard(self):
@@ -329,23 +614,37 @@ class Canvas(QObject):
         # Getting clipboard
         clipboard = QGuiApplication.clipboard()
 
-        # Saving image to a path
+        # Rendering the figure straight to memory, no file is written
         try:
-            path = os.path.join(os.path.expanduser(r"~\Documents"), "image.png")
-            self.canvas.figure.savefig(path, dpi=150, transparent=False)
-            pixmap = QPixmap()
-            # Loading image as pixmap and saving to clipboard
-            if pixmap.load(path):
-                clipboard.setImage(pixmap.toImage())
-                self.message_handler.raise_success(
-                    "Copiado com sucesso para a área de transferência!"
-                )
-            os.remove(path)
+            dpi = 150 * self.clipboard_scale
+            width = int(self.canvas.figure.get_figwidth() * dpi)
+            buffer = io.BytesIO()
+            self.canvas.figure.savefig(
+                buffer, format="rgba", dpi=dpi, transparent=False
+            )
+            data = buffer.getvalue()
+            height = len(data) // (4 * width)
+            # copy() detaches the image from the buffer before it is freed
+            image = QImage(
+                data, width, height, 4 * width, QImage.Format_RGBA8888
+            ).copy()
+            clipboard.setImage(image)
+            self.message_handler.raise_success(
+                "Copiado com sucesso para a área de transferência!"
+            )
         except Exception as error:
             self.message_handler.raise_error(
                 f"Erro copiar para a área de transferência, contatar os desenvolvedores.\n{error}"
             )
 
+    @pyqtSlot(float)
+    def set_clipboard_scale(self, scale):
+        """Escala da imagem copiada, 1 equivale a 150 dpi."""
+        if scale <= 0:
+            self.message_handler.raise_warn("A escala da cópia deve ser positiva.")
+            return
+        self.clipboard_scale = scale
+
     @pyqtSlot()
     def pan(self, *args):
         self.toolbar.pan(*args)
@@ -462,15 +761,69 @@ class Canvas(QObject):
     def set_dpi(self, dpi):
         self.dpi = dpi
 
+    @pyqtSlot(bool)
+    def set_threaded_rendering(self, enabled):
+        """Renderiza o gráfico em segundo plano, sem travar a interface."""
+        self.canvas.set_threaded(enabled)
+
     @pyqtSlot(float)
     def set_opacity_outliers(self, value: int):
         self.user_alpha_outliers = value
 
+    @pyqtSlot(bool)
+    def set_debug_mode(self, enabled):
+        """Mede o tempo de cada etapa dos quadros desenhados no canvas."""
+        self.canvas.set_profiling(enabled)
+        self.frame_stats_changed.emit()
+
+    @pyqtSlot(str)
+    def export_frame_trace(self, save_path):
+        """Salva as medidas do modo de depuração como um trace do Chrome."""
+        if self.canvas.profiler is None:
+            self.message_handler.raise_warn("O modo de depuração não está ativo.")
+            return
+        path = QUrl(save_path).toLocalFile() or save_path
+        try:
+            self.canvas.profiler.export_chrome_trace(path)
+        except OSError as error:
+            self.message_handler.raise_error(f"Erro ao salvar o trace.\n{error}")
+            return
+        self.message_handler.raise_success("Trace salvo com sucesso!")
+
+    def get_frame_stats(self):
+        """Estatísticas dos quadros, vazio fora do modo de depuração."""
+        if self.canvas is None or self.canvas.profiler is None:
+            return {}
+        return self.canvas.profiler.summary()
+
+    def on_press(self, event):
+        """Start blitting the animated artists when a pan begins."""
+        if self.toolbar._pan_info is not None:
+            self.canvas.begin_interaction(self.animated_artists)
+
+    def on_release(self, event):
+        """Go back to full draws when the pan ends."""
+        self.canvas.end_interaction()
+
     def on_motion(self, event):
         """Update the coordinates on the display."""
         if event.inaxes in (self.axes1, self.axes2):
-            self.coordinates = f"({event.xdata:.2f}, {event.ydata:.2f})"
+            # The label is updated at most once per coordinates_timer interval
+            self._pending_coordinates = f"({event.xdata:.2f}, {event.ydata:.2f})"
+            if not self.coordinates_timer.isActive():
+                self.coordinates_timer.start()
+
+    def _show_coordinates(self):
+        if self._pending_coordinates != self._coordinates:
+            self.coordinates = self._pending_coordinates
 
     coordinates = pyqtProperty(
         str, get_coordinates, set_coordinates, notify=coordinates_changed
     )
+    frame_stats = pyqtProperty(
+        "QVariantMap", get_frame_stats, notify=frame_stats_changed
+    )
+    export_progress = pyqtProperty(
+        float, get_export_progress, notify=export_progress_changed
+    )
+    exporting = pyqtProperty(bool, get_exporting, notify=exporting_changed)
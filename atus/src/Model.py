@@ -71,8 +71,10 @@ class Model(QObject):
         super().__init__()
         pd.set_option("display.expand_frame_repr", False)
         self._msg_handler: MessageHandler = messageHandler
-        self._data: pd.DataFrame = None
-        self._data_json: pd.DataFrame = None
+        # Todas as linhas dos dados, sem cópia, e as que estão marcadas
+        self._frame: pd.DataFrame = None
+        self._rows: np.ndarray | None = None
+        self._checked: pd.DataFrame = None
         self._exp_model: str = ""
         self._ind_var: str = "x"
         self._model = None
@@ -94,6 +96,12 @@ class Model(QObject):
         self._has_sx = True
         self._has_sy = True
         self._indices = []
+        # None: sem redução; 0: junta x iguais; > 0: largura dos intervalos de x
+        self.reduce_tol: float | None = None
+        self._reduction: tuple[int, int, float] | None = None
+        self._weights = None
+        # Consulta (xmin, xmax) -> posições em data, dada por quem tem x ordenado
+        self.range_index = None
 
     def __str__(self):
         return self._report_fit
@@ -119,7 +127,36 @@ class Model(QObject):
 
     @data.setter
     def data(self, data):
-        self._data = data
+        self._frame = data
+        self._rows = None
+        self._checked = None
+        self.range_index = None
+
+    @property
+    def rows(self) -> np.ndarray | None:
+        """Máscara das linhas de ``data`` marcadas na tabela; None: todas."""
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows: np.ndarray | None):
+        self._rows = None if rows is None or rows.all() else rows
+        self._checked = None
+
+    @property
+    def _data(self) -> pd.DataFrame:
+        """Linhas marcadas, copiadas só quando há desmarcadas e alguém pede."""
+        if self._checked is None and self._frame is not None:
+            if self._rows is None:
+                self._checked = self._frame
+            else:
+                self._checked = pd.DataFrame(
+                    {
+                        column: self._frame[column].to_numpy()[self._rows]
+                        for column in self._frame.columns
+                    },
+                    copy=False,
+                )
+        return self._checked
 
     def _create_model(self) -> bool:
         """Cria o modelo de ajuste."""
@@ -148,30 +185,53 @@ class Model(QObject):
             return None
         # Getting coefficients
         self._coef = [i for i in self._model.param_names]
-        # Data
-        x, y, sy, sx = self.data
-        self._indices = np.arange(len(self._data.index))
-        if self.xmin != self.xmax:
-            self._indices = np.where(
-                (self.xmin <= self._data["x"]) & (self.xmax >= self._data["x"])
-            )[0]
+        # Data: views of every row, gathered once for the checked rows in range
         x, y, sy, sx = (
-            x.iloc[self._indices].to_numpy(),
-            y.iloc[self._indices].to_numpy(),
-            sy.iloc[self._indices].to_numpy(),
-            sx.iloc[self._indices].to_numpy(),
+            self._frame[column].to_numpy() for column in ("x", "y", "sy", "sx")
         )
+        rows = self._rows
+        if self.xmin == self.xmax:
+            self._indices = np.arange(len(x)) if rows is None else np.flatnonzero(rows)
+        elif self.range_index is not None:
+            self._indices = self.range_index(self.xmin, self.xmax)
+            if rows is not None:
+                self._indices = self._indices[rows[self._indices]]
+        else:
+            inside = (self.xmin <= x) & (x <= self.xmax)
+            if rows is not None:
+                inside &= rows
+            self._indices = np.flatnonzero(inside)
+        if len(self._indices) < len(x):
+            x, y, sy, sx = (
+                x[self._indices],
+                y[self._indices],
+                sy[self._indices],
+                sx[self._indices],
+            )
+            if self._checked is None and len(self._indices) == self._checked_count:
+                # O intervalo pega todas as marcadas: a mesma cópia serve ao gráfico
+                self._checked = pd.DataFrame(
+                    {"x": x, "y": y, "sy": sy, "sx": sx}, copy=False
+                )
+        x_fit, y_fit, sy_fit = x, y, sy
+        self._reduction = None
+        self._weights = None
+        # O ODR usa o sx de cada ponto, só o MMQ é feito sobre os grupos
+        if self.reduce_tol is not None and not (self._has_sx and not wsx):
+            x_fit, y_fit, sy_fit = self._reduce(
+                x, y, sy, weighted=self._has_sy and not wsy
+            )
         data = None
         if self._has_sy and self._has_sx:  # Caso com as duas incs
             if (wsx is True) and (wsy is True):
-                self.__fit_lm_wy(x, y)
+                self.__fit_lm_wy(x_fit, y_fit)
                 if (self._result is None) is False:
                     self.__set_param_values_lm_special(x)
                     self.__set_report_lm_special(x)
                 else:
                     return None
             elif wsx:
-                self.__fit_lm(x, y, sy)
+                self.__fit_lm(x_fit, y_fit, sy_fit)
                 if (self._result is None) is False:
                     self.__set_param_values_lm(x)
                     self.__set_report_lm(x)
@@ -194,14 +254,14 @@ class Model(QObject):
                     return None
         elif self._has_sy:  # Caso com a incerteza só em y
             if wsy:
-                self.__fit_lm_wy(x, y)
+                self.__fit_lm_wy(x_fit, y_fit)
                 if (self._result is None) is False:
                     self.__set_param_values_lm_special(x)
                     self.__set_report_lm_special(x)
                 else:
                     return None
             else:
-                self.__fit_lm(x, y, sy)
+                self.__fit_lm(x_fit, y_fit, sy_fit)
                 if (self._result is None) is False:
                     self.__set_param_values_lm(x)
                     self.__set_report_lm(x)
@@ -209,7 +269,7 @@ class Model(QObject):
                     return None
         elif self._has_sx:  # Caso com a incerteza só em x
             if wsx:
-                self.__fit_lm_wy(x, y)
+                self.__fit_lm_wy(x_fit, y_fit)
                 if (self._result is None) is False:
                     self.__set_param_values_lm_special(x)
                     self.__set_report_lm_special(x)
@@ -223,18 +283,51 @@ class Model(QObject):
                 else:
                     return None
         else:  # Caso sem incertezas
-            self.__fit_lm_wy(x, y)
+            self.__fit_lm_wy(x_fit, y_fit)
             if (self._result is None) is False:
                 self.__set_param_values_lm_special(x)
                 self.__set_report_lm_special(x)
             else:
                 return None
+        if self._reduction is not None:
+            count, groups, _ = self._reduction
+            self._report_fit += (
+                f"\nRedução: {count} pontos ajustados como {groups} grupos"
+                + (
+                    " de x iguais.\n"
+                    if self.reduce_tol == 0
+                    else f" de x em intervalos de {self.reduce_tol:g}.\n"
+                )
+            )
         params = self.get_params()
         keys = list(params.keys())
         for i in range(len(keys)):
             self.fillParamsTable.emit(keys[i], params[keys[i]][0], params[keys[i]][1])
         self.writeInfos.emit(self._report_fit)
 
+    def _reduce(self, x, y, sy, weighted: bool):
+        """Junta os pontos de mesmo x (ou do mesmo intervalo) na média ponderada.
+
+        Com x iguais, o ajuste dos grupos dá os mesmos parâmetros e incertezas
+        do ajuste dos pontos: cada grupo tem peso igual à soma dos pesos dos
+        seus pontos. O chi² e o NGL do relatório continuam sendo os dos pontos.
+        """
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+        w = 1 / sy[order] ** 2 if weighted else np.ones(len(x))
+        keys = x if self.reduce_tol == 0 else np.floor(x / self.reduce_tol)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        sum_w = np.add.reduceat(w, starts)
+        x_g = np.add.reduceat(w * x, starts) / sum_w
+        y_g = np.add.reduceat(w * y, starts) / sum_w
+        counts = np.diff(np.r_[starts, len(x)])
+        # Dispersão dentro dos grupos, que o chi² dos grupos não vê
+        within = float(np.sum(w * (y - np.repeat(y_g, counts)) ** 2))
+        self._reduction = (len(x), len(starts), within)
+        # Sem incertezas, o peso de cada grupo é o número de pontos
+        self._weights = None if weighted else np.sqrt(sum_w)
+        return x_g, y_g, 1 / np.sqrt(sum_w)
+
     def __make_parameters_lm(self):
         """Constrói os parâmetros para ajuste com o lmfit."""
         self._params = Parameters()
@@ -526,13 +619,16 @@ class Model(QObject):
             )
             self._result = None
             return None
+        if self._reduction is not None:
+            # Chi² dos pontos: o dos grupos mais a dispersão dentro deles
+            self._result.chisqr += self._reduction[2]
 
     def __fit_lm_wy(self, x, y):
         """Fit com MMQ quando não há incertezas."""
         self.__make_parameters_lm()
         try:
             self._result = eval(
-                f"self._model.fit(data = y, {self._ind_var} = x, params = self._params, scale_covar=False, max_nfev = 250)",
+                f"self._model.fit(data = y, {self._ind_var} = x, weights = self._weights, params = self._params, scale_covar=False, max_nfev = 250)",
                 None,
                 {"y": y, "x": x, "self": self},
             )
@@ -552,6 +648,9 @@ class Model(QObject):
             )
             self._result = None
             return None
+        if self._reduction is not None:
+            # Chi² dos pontos: o dos grupos mais a dispersão dentro deles
+            self._result.chisqr += self._reduction[2]
 
     def get_params(self):
         """Retorna um dicionário onde as keys são os parâmetros e que retornam uma lista com [valor, incerteza]."""
@@ -823,15 +922,25 @@ class Model(QObject):
             {"x_plot": x_plot, "self": self},
         )
 
+    @property
+    def _checked_count(self) -> int:
+        if self._rows is None:
+            return len(self._frame)
+        return int(np.count_nonzero(self._rows))
+
     @property
     def inliers(self):
-        """Retorna os pontos usados no ajuste."""
-        return self._indices
+        """Retorna os pontos usados no ajuste, em posições de ``data``."""
+        if self._rows is None:
+            return self._indices
+        return np.cumsum(self._rows)[self._indices] - 1
 
     @property
     def outliers(self):
         """Retorna os pontos não usados no ajuste."""
-        return np.array(list(set(np.arange(len(self._data))) - set(self._indices)))
+        outside = np.ones(self._checked_count, dtype=bool)
+        outside[self.inliers] = False
+        return np.flatnonzero(outside)
 
     @property
     def exp_model(self):
@@ -992,7 +1101,9 @@ class Model(QObject):
         #             coefs_2[self._coef[i]] = True
         # for nome in coefs.keys():
         #     self._params.add(nome, coefs[nome][0], vary = coefs[nome][1])
-        self._indices = np.arange(len(self._data))
+        self._indices = np.arange(len(self._frame))
+        if self._rows is not None:
+            self._indices = np.flatnonzero(self._rows)
         self._isvalid = True
 
     def matprint(self, mat, fmt="f"):
@@ -1115,7 +1226,9 @@ class Model(QObject):
             )
 
     def reset(self):
-        self._data = None
+        self._frame = None
+        self._rows = None
+        self._checked = None
 
         self._exp_model = ""
         self._model = None
@@ -1133,3 +1246,5 @@ class Model(QObject):
         self._has_sx = True
         self._has_sy = True
         self._indices = []
+        self._reduction = None
+        self._weights = None
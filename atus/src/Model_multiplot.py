@@ -23,29 +23,23 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-# import numpy as np
-import pandas as pd
+import numpy as np
 
 # from matplotlib_backend_qtquick.qt_compat import QtCore
 from PyQt5.QtCore import QObject
 from lmfit.models import ExpressionModel
 from lmfit import Parameters
 
+from .DataStore import DataStore
+
 
 class MultiModel(QObject):
     def __init__(self, options: dict, arquivos: list):
         super().__init__()
         self.options = options
         self.arquivos = arquivos
-        self.dfs = [
-            pd.DataFrame.from_records(
-                arquivo["df"], columns=["x", "y", "sy", "sx", "bool"]
-            ).astype(float)
-            for arquivo in self.arquivos
-        ]
-        for i in range(len(self.dfs)):
-            self.dfs[i] = self.dfs[i][self.dfs[i]["bool"] == 1]
-            del self.dfs[i]["bool"]
+        self.stores = [self._checked_rows(arquivo["df"]) for arquivo in self.arquivos]
+        self.dfs = [store.frame() for store in self.stores]
         self.num_cols = [len(df.columns) for df in self.dfs]
         self.models = []
         self.parameters = []
@@ -74,3 +68,14 @@ class MultiModel(QObject):
                 self.models.append(0)
                 self.parameters.append(0)
                 self.indVars.append("")
+
+    @staticmethod
+    def _checked_rows(records: list) -> DataStore:
+        """Store de uma tabela; o frame não copia quando todas estão marcadas.
+
+        Arquivos carregados de uma pasta já chegam como DataStore.
+        """
+        if isinstance(records, DataStore):
+            return records
+        values = np.array(records, dtype=np.float64).reshape(-1, 5)
+        return DataStore(values[:, :4].T, values[:, 4] == 1)
@@ -23,11 +23,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import itertools
 import json
 import numpy as np
 import pandas as pd
 import platform
+from matplotlib import colors
 from PyQt5.QtCore import QObject, QJsonValue, QUrl, pyqtSignal, pyqtSlot
+from .DataHandler import DataHandler
+from .DataStore import DataStore
 from .Model_multiplot import MultiModel
 
 
@@ -39,11 +43,15 @@ class Multiplot(QObject):
     fillPageSignal = pyqtSignal(QJsonValue, arguments="props")
     addRow = pyqtSignal(QJsonValue, arguments="rowData")
 
-    def __init__(self, displayBridge, messageHandler):
+    def __init__(self, displayBridge, messageHandler, datahandler):
         super().__init__()
         self.path = ""
         self.displayBridge = displayBridge
         self.msg = messageHandler
+        self.datahandler: DataHandler = datahandler
+        # Stores dos arquivos de uma pasta; a tabela do QML só guarda a chave
+        self._stores: dict[str, DataStore] = {}
+        self._store_keys = itertools.count()
         self.Multi_Model = None
         self.grid = 0.0
         self.xmin = 0.0
@@ -150,6 +158,19 @@ class Multiplot(QObject):
         # Filling page
         self.fillPageSignal.emit(QJsonValue.fromVariant(props))
 
+    @staticmethod
+    def _store_key(df) -> str:
+        """Chave do store de uma linha carregada de pasta, None para registros."""
+        return df.get("store") if isinstance(df, dict) else None
+
+    def _with_records(self, props: dict) -> dict:
+        """Troca as referências aos stores pelas linhas, para o projeto salvo."""
+        for projeto in props.get("rowsData", []):
+            key = self._store_key(projeto["df"])
+            if key is not None:
+                projeto["df"] = self._stores[key].to_records()
+        return props
+
     @pyqtSlot(QJsonValue, result=int)
     def save(self, props):
         # If there's no path for saving, save_as()
@@ -157,7 +178,7 @@ class Multiplot(QObject):
             return 1
 
         # Getting properties
-        props = props.toVariant()
+        props = self._with_records(props.toVariant())
 
         if platform.system() == "Linux":
             if self.path[-5:] == ".json":
@@ -178,7 +199,7 @@ class Multiplot(QObject):
         self.path = QUrl(path).toLocalFile()
 
         # Getting properties
-        props = props.toVariant()
+        props = self._with_records(props.toVariant())
 
         if platform.system() == "Linux":
             if self.path[-5:] == ".json":
@@ -232,12 +253,45 @@ class Multiplot(QObject):
             )
             self.removeRow.emit(row)
 
+    @pyqtSlot(str, int)
+    def loadFolder(self, folderUrl: str, start: int) -> None:
+        """Adiciona uma linha por arquivo de dados da pasta ou padrão glob."""
+        pattern = QUrl(folderUrl).toLocalFile() or folderUrl
+        datasets = self.datahandler.load_files(pattern)
+        for row, (fileName, store) in enumerate(datasets, start=start):
+            key = f"{fileName}#{next(self._store_keys)}"
+            self._stores[key] = store
+            self.addRow.emit(
+                QJsonValue.fromVariant(
+                    {
+                        "row": row,
+                        # Só a referência: as linhas ficam no store, sem virar texto
+                        "data": {"store": key, "rows": len(store)},
+                        "params": {},
+                        "fileName": fileName,
+                        "projectName": fileName.rsplit(".", 1)[0],
+                        "expr": "",
+                        "p0": "",
+                        "symbolColor": colors.to_hex(f"C{row % 10}"),
+                        "curve": 0,
+                        "marker_size": 3,
+                        "curve_thickness": 3,
+                    }
+                )
+            )
+
     @pyqtSlot(QJsonValue)
     def get_data(self, data: QJsonValue) -> None:
         """Get data from frontend and make a plot."""
         dados = data.toVariant()
         graph_options = dados["canvasProps"]
         projetos = dados["rowsData"]
+        keys = {self._store_key(projeto["df"]) for projeto in projetos}
+        self._stores = {key: self._stores[key] for key in keys if key is not None}
+        for projeto in projetos:
+            key = self._store_key(projeto["df"])
+            if key is not None:
+                projeto["df"] = self._stores[key]
         self.Multi_Model = MultiModel(graph_options, projetos)
         self.grid = graph_options["grid"]
         self.logx = graph_options["logx"]
@@ -264,7 +318,11 @@ class Multiplot(QObject):
         # Plotting points
         for i in range(len(self.Multi_Model.models)):
             if self.Multi_Model.arquivos[i]["marker"] is True:
-                self.plot_sx_sy(self.Multi_Model.dfs[i], self.Multi_Model.arquivos[i])
+                self.plot_sx_sy(
+                    self.Multi_Model.dfs[i],
+                    self.Multi_Model.arquivos[i],
+                    self.Multi_Model.stores[i],
+                )
 
         # Setting canvas properties
         self.displayBridge.set_axes_props_without_axes_2(
@@ -308,6 +366,9 @@ class Multiplot(QObject):
                     lines,
                 )
 
+        for line in lines:
+            self.displayBridge.add_animated_artist(line)
+
         handles, labels = self.displayBridge.axes1.get_legend_handles_labels()
         if len(handles) > 1:
             labels.reverse()
@@ -332,8 +393,19 @@ class Multiplot(QObject):
             )
         self.displayBridge.canvas.draw_idle()
 
-    def plot_sx_sy(self, df: pd.DataFrame, options: dict) -> None:
+    def plot_sx_sy(
+        self, df: pd.DataFrame, options: dict, store: DataStore = None
+    ) -> None:
         """Plot points."""
+        if self.displayBridge.use_density(len(df.index)):
+            self.displayBridge.plot_density(
+                df["x"],
+                df["y"],
+                options["markerColor"],
+                label=options["label"],
+                order=None if store is None else store.x_order(),
+            )
+            return
         if options["label"] != "":
             self.displayBridge.axes1.errorbar(
                 df["x"],
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+MIT License
+
+Copyright (c) 2021 Leonardo Eiji Tamayose, Guilherme Ferrari Fortino
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ParseCache:
+    """
+    Arrays já lidos de arquivos, compartilhados por todas as páginas.
+
+    A chave é o arquivo (caminho, mtime e tamanho) mais as opções de leitura,
+    então um arquivo alterado nunca devolve dados antigos. Os itens menos
+    usados saem quando o total passa de ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 28) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items: OrderedDict[tuple, tuple[np.ndarray, object]] = OrderedDict()
+        # load_files lê arquivos em várias threads
+        self._lock = threading.Lock()
+
+    def key(self, path: str, **options) -> tuple | None:
+        """Chave do arquivo no estado atual, None se ele não existe."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (
+            os.path.realpath(path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            tuple(
+                sorted(
+                    (name, tuple(value) if isinstance(value, list) else value)
+                    for name, value in options.items()
+                )
+            ),
+        )
+
+    def get(self, key: tuple | None) -> tuple[np.ndarray, object] | None:
+        """Array e metadados guardados; o array não deve ser alterado."""
+        if key is None:
+            return None
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: tuple | None, values: np.ndarray, meta=None) -> None:
+        if key is None or values.nbytes > self.max_bytes:
+            return None
+        values.flags.writeable = False
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[0].nbytes
+            self._items[key] = (values, meta)
+            self.nbytes += values.nbytes
+            while self.nbytes > self.max_bytes:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# Uma instância para o processo todo
+parse_cache = ParseCache()
@@ -44,6 +44,8 @@ class SinglePlot(QObject):
     write_calculator = pyqtSignal(str, arguments="expr")
     fill_plot_page_signal = pyqtSignal(QJsonValue, arguments="props")
     plot_signal = pyqtSignal()
+    # Índice da página do ajuste simples no menu do QML
+    page = 1
 
     def __init__(self, canvas, model, datahandler, messageHandler):
         super().__init__()
@@ -52,6 +54,12 @@ class SinglePlot(QObject):
         self.datahandler: DataHandler = datahandler
         self.path = ""
         self.msg = messageHandler
+        # Parâmetros do último ajuste, chute inicial do reajuste com linhas novas
+        self._warm_start: dict[str, float] = {}
+        # Linhas novas chegaram com outra página no canvas
+        self._refit_pending = False
+        self.datahandler.dataAppended.connect(self.refit)
+        self.canvas.page_activated.connect(self._page_activated)
 
         # Default properties for the singlePlot page
         self.props = {
@@ -89,24 +97,41 @@ class SinglePlot(QObject):
                 "wsy": True,
                 "xmin": "",
                 "xmax": "",
+                "reduce": "",
                 "parameters": {},
                 "adjust": True,
             },
+            "transforms": {"x": "", "y": ""},
             "data": [],
         }
 
+    def _set_model_data(self) -> None:
+        """Todas as linhas do store, sem cópia, e a máscara das marcadas.
+
+        O Model junta a máscara com o intervalo de ajuste, buscado no x
+        ordenado do store, e copia só as linhas que entram no ajuste.
+        """
+        store = self.datahandler.fit_store
+        if store is None:
+            self.model.data = None
+            return None
+        self.model.data = store.view()
+        self.model.rows = store.mask
+        self.model.range_index = store.x_range
+
     @pyqtSlot(QJsonValue)
     def get_plot_data(self, plot_data):
         self.model.reset()
-        self.datahandler.reset()
         plot_data: dict = plot_data.toVariant()
         canvas_props = plot_data["canvasProps"]
         dataProps = plot_data["dataProps"]
         fit_props = plot_data["fitProps"]
 
-        # Loading data from the table
-        self.datahandler.loadDataTable(plot_data["data"])
-        self.model.data = self.datahandler.data
+        # Loading data from the table, after the column transforms
+        if not self.datahandler.set_transforms(plot_data.get("transforms")):
+            return None
+        self.datahandler.load_table()
+        self._set_model_data()
         self.model._has_sx = self.datahandler.has_sx
         self.model._has_sy = self.datahandler.has_sy
 
@@ -139,9 +164,22 @@ class SinglePlot(QObject):
             # p0 = p0.replace(";", ",")
             p0 = p0.replace("/", ",")
             self.model.set_p0(p0)
+        elif self._warm_start:
+            self.model.set_p0(
+                ",".join(
+                    f"{name}={np.format_float_positional(value)}"
+                    for name, value in self._warm_start.items()
+                )
+            )
+        self._warm_start = {}
 
         self.model.xmin = self.make_float(fit_props["xmin"], value=-np.inf)
         self.model.xmax = self.make_float(fit_props["xmax"], value=np.inf)
+        # Vazio deixa os pontos como estão; 0 junta os x iguais
+        reduce_tol = self.make_float(fit_props.get("reduce", ""), value=None)
+        self.model.reduce_tol = (
+            reduce_tol if reduce_tol is not None and reduce_tol >= 0 else None
+        )
 
         if self.model.xmin >= self.model.xmax:
             self.msg.raise_error(
@@ -418,6 +456,7 @@ class SinglePlot(QObject):
                             line_func.set_data(ppx, ppy)
                             self.canvas.axes1.figure.canvas.draw_idle()
 
+                    self.canvas.add_animated_artist(line_func)
                     self.canvas.axes1.remove_callback(self.canvas.oid)
                     self.canvas.axes1.figure.canvas.mpl_disconnect(self.canvas.cid)
                     self.canvas.oid = self.canvas.axes1.callbacks.connect(
@@ -507,6 +546,7 @@ class SinglePlot(QObject):
                             line_func.set_data(ppx, ppy)
                             self.canvas.axes1.figure.canvas.draw_idle()
 
+                    self.canvas.add_animated_artist(line_func)
                     self.canvas.axes1.remove_callback(self.canvas.oid)
                     self.canvas.axes1.figure.canvas.mpl_disconnect(self.canvas.cid)
                     self.canvas.oid = self.canvas.axes1.callbacks.connect(
@@ -565,6 +605,31 @@ class SinglePlot(QObject):
         else:
             self.fill_plot_page_signal.emit(QJsonValue.fromVariant(props))
 
+    @pyqtSlot(int)
+    def _page_activated(self, page: int) -> None:
+        if page == self.page and self._refit_pending:
+            self.refit()
+
+    @pyqtSlot()
+    def refit(self):
+        """Refaz o ajuste e o gráfico quando chegam linhas novas do arquivo.
+
+        O ajuste parte dos parâmetros do anterior, que já estão perto dos
+        novos. Só acontece se já houve um gráfico. Com outra página no canvas,
+        o desenho iria para a figura dela: o reajuste espera a volta para esta.
+        """
+        if self.model._data is None:
+            return None
+        if self.canvas.page not in (None, self.page):
+            self._refit_pending = True
+            return None
+        self._refit_pending = False
+        self._warm_start = {
+            name: value for name, (value, _) in self.model.get_params().items()
+        }
+        # A página manda as propriedades atuais para get_plot_data
+        self.plot_signal.emit()
+
     @pyqtSlot()
     def new(self):
         # Reseting canvas and model
@@ -609,7 +674,8 @@ class SinglePlot(QObject):
                 return 0
             # Loading data from the project
             self.datahandler.load_data(df_array=props["data"])
-            self.model.data = self.datahandler.data
+            self.datahandler.set_transforms(props.get("transforms"))
+            self._set_model_data()
             self.model._has_sx = self.datahandler.has_sx
             self.model._has_sy = self.datahandler.has_sy
 
@@ -625,7 +691,7 @@ class SinglePlot(QObject):
                 )
                 return 0
             self.datahandler.load_data(df_array=props["data"])
-            self.model.data = self.datahandler.data
+            self._set_model_data()
             self.model._has_sx = self.datahandler.has_sx
             self.model._has_sy = self.datahandler.has_sy
 
@@ -688,6 +754,8 @@ class SinglePlot(QObject):
         # Getting properties
         props = props.toVariant()
         props["fitProps"]["parameters"] = self.model.params.valuesdict()
+        store = self.datahandler.store
+        props["data"] = [] if store is None else store.to_records()
 
         if platform.system() == "Linux":
             if self.path[-5:] == ".json":
@@ -710,6 +778,8 @@ class SinglePlot(QObject):
         # Getting properties
         props = props.toVariant()
         props["fitProps"]["parameters"] = self.model.params.valuesdict()
+        store = self.datahandler.store
+        props["data"] = [] if store is None else store.to_records()
 
         if platform.system() == "Linux":
             if self.path[-5:] == ".json":
@@ -772,16 +842,15 @@ class SinglePlot(QObject):
         plot(self.canvas, x, y, x_area, y_area, title, xlabel, ylabel)
         self.write_calculator.emit(s)
 
-    @pyqtSlot(QJsonValue)
-    def export_data_clipboard(self, data):
-        df = pd.DataFrame.from_records(data.toVariant())
+    @pyqtSlot()
+    def export_data_clipboard(self):
+        store = self.datahandler.store
 
-        if df.empty:
+        if store is None or len(store) == 0:
             self.msg.raise_warn("Nenhum dado para exportar.")
             return
 
-        df.columns = ["x", "y", "sy", "sx", "bool"]
-        del df["bool"]
+        df = pd.DataFrame(store.values.T, columns=list(store.columns))
         df.to_clipboard(index=False)
 
         self.msg.raise_success("Dados copiados para área de transferência.")
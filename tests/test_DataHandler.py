@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+from atus.src.ColumnTransform import ColumnTransform
 from atus.src.DataHandler import DataHandler
+from atus.src.DataStore import DataStore
 import pytest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 from pandas.testing import assert_frame_equal
 from copy import deepcopy
+import numpy as np
 from io import StringIO
 from PyQt5.QtCore import QUrl
 import os
+import sys
 import tempfile
 from atus.src.MessageHandler import MessageHandler
+from atus.src.ParseCache import ParseCache, parse_cache
 
 
 @pytest.mark.data_handler
@@ -21,14 +26,13 @@ class TestDataHandler:
         return DataHandler(messageHandler)
 
     def test_reset(self, data_handler: DataHandler):
-        data_handler._data = pd.DataFrame([1])
-        data_handler._data_json = pd.DataFrame(["1"])
-        data_handler._has_data = True
+        data_handler._set_store(DataStore(np.ones((4, 1))))
         data_handler._has_sx = False
         data_handler._has_sy = False
         data_handler.reset()
-        assert data_handler._data == None
-        assert data_handler._data_json == None
+        assert data_handler.store == None
+        assert data_handler.table.count == 0
+        assert data_handler.data == None
         assert data_handler._has_data == False
         assert data_handler.has_sx == True
         assert data_handler.has_sy == True
@@ -48,9 +52,9 @@ class TestDataHandler:
             data_handler._read_csv(data_path)
         df = pd.DataFrame(
             [
-                ["1", "2", "3", "4"],
-                ["5", "6", "7", "8"],
-                ["9", "10", "11", "12"],
+                [1.0, 2.0, 3.0, 4.0],
+                [5.0, 6.0, 7.0, 8.0],
+                [9.0, 10.0, 11.0, 12.0],
             ],
             columns=["x", "y", "sy", "sx"],
         )
@@ -83,9 +87,9 @@ class TestDataHandler:
             data_handler._read_tsv_txt(data_path)
         df = pd.DataFrame(
             [
-                ["1", "2", "3", "4"],
-                ["5", "6", "7", "8"],
-                ["9", "10", "11", "12"],
+                [1.0, 2.0, 3.0, 4.0],
+                [5.0, 6.0, 7.0, 8.0],
+                [9.0, 10.0, 11.0, 12.0],
             ],
             columns=["x", "y", "sy", "sx"],
         )
@@ -109,9 +113,9 @@ class TestDataHandler:
             data_handler._read_tsv_txt(data_path)
         df = pd.DataFrame(
             [
-                ["1", "2", "3", "4"],
-                ["5", "6", "7", "8"],
-                ["9", "10", "11", "12"],
+                [1.0, 2.0, 3.0, 4.0],
+                [5.0, 6.0, 7.0, 8.0],
+                [9.0, 10.0, 11.0, 12.0],
             ],
             columns=["x", "y", "sy", "sx"],
         )
@@ -178,6 +182,14 @@ class TestDataHandler:
         result = data_handler._to_float(test_df)
         pd.testing.assert_frame_equal(result, expected)
 
+    @pytest.mark.filterwarnings("error::pandas.errors.SettingWithCopyWarning")
+    def test_to_float_slice(self, data_handler: DataHandler):
+        df = pd.DataFrame([["1", "2"], ["a", "b"], ["3", "4"]], columns=["x", "y"])
+        sliced = df[df["x"] != "a"]
+        result = data_handler._to_float(sliced)
+        assert result.values.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+        assert sliced["x"].tolist() == ["1", "3"]
+
     # def test_to_float_error(self, data_handler: DataHandler):
     #     columns = ["x"]
     #     test_data = [["NEYMAR"], ["NEYMAR"]]
@@ -221,12 +233,8 @@ class TestDataHandler:
         has_sx,
         has_sy,
     ):
-        data_handler._df = four_columns_df[input_columns]
-        data_handler._data_json = deepcopy(data_handler._df)
-        (
-            data_handler._df,
-            data_handler._data_json,
-        ) = data_handler._to_check_columns(data_handler._df, data_handler._data_json)
+        data_handler._df = deepcopy(four_columns_df[input_columns])
+        data_handler._df = data_handler._to_check_columns(data_handler._df)
         expected_df = deepcopy(four_columns_df)
 
         for col in other_columns.keys():
@@ -263,9 +271,8 @@ class TestDataHandler:
     ):
         df = pd.DataFrame(data, columns=columns)
         data_handler._df = df
-        data_handler._data_json = deepcopy(data_handler._df)
         data_handler._msg_handler.raise_warn = MagicMock()
-        data_handler._to_check_columns(data_handler._df, data_handler._data_json)
+        data_handler._to_check_columns(data_handler._df)
         data_handler._msg_handler.raise_warn.assert_called_once_with(message)
 
     @pytest.mark.parametrize(
@@ -283,13 +290,10 @@ class TestDataHandler:
     ):
         df = pd.DataFrame(data, columns=columns)
         data_handler._df = df
-        data_handler._data_json = deepcopy(data_handler._df)
         data_handler._msg_handler.raise_error = MagicMock()
-        df2, data_json = data_handler._to_check_columns(
-            data_handler._df, data_handler._data_json
-        )
+        df2 = data_handler._to_check_columns(data_handler._df)
         data_handler._msg_handler.raise_error.assert_called_once_with(message)
-        assert (df2, data_json) == (None, None)
+        assert df2 is None
 
     @patch("atus.src.DataHandler.DataHandler._read_csv")
     @patch("atus.src.DataHandler.DataHandler._read_tsv_txt")
@@ -310,11 +314,29 @@ class TestDataHandler:
 
     def test_fill_df_with_clipboardText(self, data_handler: DataHandler):
         clipboardText = "1\t2\t3\t4\n5\t6\t7\t8"
-        df = pd.read_csv(StringIO(clipboardText), sep="\t", header=None, dtype=str)
+        df = pd.read_csv(StringIO(clipboardText), sep="\t", header=None, dtype=float)
         df = df.rename(columns={0: "x", 1: "y", 2: "sy", 3: "sx"})
         data_handler._fill_df_with_clipboardText(clipboardText)
         pd.testing.assert_frame_equal(df, data_handler._df)
 
+    @pytest.mark.parametrize(
+        "clipboardText, data_expected, warns",
+        [
+            ("1,5\t2,5\n3,5\t4,5", [[1.5, 2.5], [3.5, 4.5]], False),
+            ("x\ty\n1,5\t2.5\n3\t4", [[1.5, 2.5], [3.0, 4.0]], True),
+            ("1 2 3\n\n4 5", [[1.0, 2.0, 3.0], [4.0, 5.0, 0.0]], False),
+        ],
+    )
+    def test_fill_df_with_clipboardText_parses_numbers(
+        self, data_handler: DataHandler, clipboardText, data_expected, warns
+    ):
+        data_handler._msg_handler.raise_warn = MagicMock()
+        data_handler._fill_df_with_clipboardText(clipboardText)
+        df = pd.DataFrame(data_expected)
+        df = df.rename(columns={0: "x", 1: "y", 2: "sy", 3: "sx"})
+        pd.testing.assert_frame_equal(data_handler._df, df)
+        assert data_handler._msg_handler.raise_warn.called == warns
+
     def test_check_if_load_data_use_right_method(self, data_handler: DataHandler):
         data_handler._to_float = MagicMock()
 
@@ -431,18 +453,18 @@ class TestDataHandler:
             ("Neymar", [["1", "2", "3", "4"]]),
         ],
     )
-    def test_load_data_bottom_data_json(
+    def test_load_data_bottom_text(
         self, data_handler: DataHandler, clipboardText_bottom, data_expected
     ):
-        df_top = pd.DataFrame([["1", "2", "3", "4"]])
-        df_top = df_top.rename(columns={0: "x", 1: "y", 2: "sy", 3: "sx"})
-        data_handler._data_json = df_top
-        data_handler.load_data()
+        data_handler.load_data(df_array=[["1", "2", "3", "4", True]])
         data_handler._load_data_bottom(clipboardText_bottom)
 
         df_expected = pd.DataFrame(data_expected)
         df_expected = df_expected.rename(columns={0: "x", 1: "y", 2: "sy", 3: "sx"})
-        pd.testing.assert_frame_equal(data_handler._data_json, df_expected)
+        records = [row[:4] for row in data_handler.store.to_records()]
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(records, columns=["x", "y", "sy", "sx"]), df_expected
+        )
 
     @pytest.mark.parametrize(
         "clipboardText_bottom, data_expected",
@@ -548,6 +570,23 @@ class TestDataHandler:
         )
         data_handler._msg_handler.raise_warn.assert_called_once_with(message)
 
+    def test_load_data_bottom_appends_in_place(self, data_handler: DataHandler):
+        data_handler.load_data(df_array=[["1", "2", "3", "4", True]])
+        store = data_handler.store
+        data_handler._msg_handler.raise_warn = MagicMock()
+        for i in range(10):
+            data_handler._load_data_bottom(f"{i}\t1\t2\t3")
+        assert data_handler.store is store
+        assert len(store) == 11
+        assert store.nbytes < 4 * 8 * 11 * 2 + 64
+        data_handler._msg_handler.raise_warn.assert_not_called()
+
+        data_handler._load_data_bottom("5\t6\t0\t1")
+        assert data_handler.has_sy == False
+        assert data_handler.has_sx == True
+        data_handler._msg_handler.raise_warn.assert_called_once()
+        assert data_handler._df["sy"].tolist()[-2:] == [2.0, 0.0]
+
     @pytest.mark.parametrize(
         "data, has_sy, has_sx, message",
         [
@@ -574,10 +613,393 @@ class TestDataHandler:
         assert has_sx == data_handler.has_sx
         assert has_sy == data_handler.has_sy
 
+    def test_loadDataTable_mask(self, data_handler: DataHandler):
+        data = [["1", "2", "3", "4", 1], ["5", "", "7", "8", 0], ["9", "10", "11", "12", 1]]
+        data_handler.loadDataTable(data)
+        assert len(data_handler.store) == 3
+        assert data_handler.store["y"][1] == 0.0
+        df = pd.DataFrame(
+            [[1.0, 2.0, 3.0, 4.0], [9.0, 10.0, 11.0, 12.0]],
+            columns=["x", "y", "sy", "sx"],
+        )
+        pd.testing.assert_frame_equal(data_handler.data, df)
+
+    def test_table_edits(self, data_handler: DataHandler):
+        data = [["1", "2", "3", "4", 1], ["5", "6", "7", "8", 1]]
+        data_handler.loadDataTable(data)
+        table = data_handler.table
+        assert table.rowCount() == 2
+        assert table.data(table.index(1, 1)) == "6"
+
+        assert table.set_value(1, 1, "6,5")
+        assert not table.set_value(1, 1, "a")
+        table.set_checked(0, False)
+        table.apply_operation("Multiplicar", "x", "", "2")
+        table.apply_operation("Trocar", "sy", "sx", "0")
+        table.add_rows(1)
+        assert table.count == 3
+        table.remove_row(2)
+
+        data_handler.load_table()
+        df = pd.DataFrame([[10.0, 6.5, 8.0, 7.0]], columns=["x", "y", "sy", "sx"])
+        pd.testing.assert_frame_equal(data_handler.data, df)
+
+    def test_load_table_reuses_unchanged_data(self, data_handler: DataHandler):
+        data = [["1", "2", "3", "4", 1], ["5", "6", "0", "8", 0], ["9", "10", "11", "12", 1]]
+        data_handler.loadDataTable(data)
+        frame = data_handler.data
+        data_handler._msg_handler.raise_warn = MagicMock()
+        data_handler.load_table()
+        assert data_handler.data is frame
+        data_handler._msg_handler.raise_warn.assert_not_called()
+
+        # Editing a cell patches the filtered frame in place
+        data_handler.table.set_value(2, 0, "7")
+        data_handler.load_table()
+        assert data_handler.data is frame
+        assert frame["x"].tolist() == [1.0, 7.0]
+
+        data_handler.table.set_checked(1, True)
+        data_handler.load_table()
+        assert data_handler.has_sy == False
+        data_handler._msg_handler.raise_warn.assert_called_once()
+
+    def test_x_order(self, data_handler: DataHandler):
+        data = [["3", "0", "0", "0", 1], ["1", "0", "0", "0", 0], ["2", "0", "0", "0", 1]]
+        data += [["2", "0", "0", "0", 1], ["5", "0", "0", "0", 1]]
+        data_handler.loadDataTable(data)
+        store = data_handler.store
+        # The whole x inside the window: every row, without sorting
+        assert store.x_range(-np.inf, np.inf).tolist() == [0, 1, 2, 3, 4]
+        assert store._order_version != store.values_version
+        # Positions in the checked rows, ties kept in table order
+        assert store.x_order().tolist() == [1, 2, 0, 3]
+        assert store.x_order() is store.x_order()
+        # Positions in all the rows, checked or not
+        assert store.x_range(2.0, 3.0).tolist() == [0, 2, 3]
+        assert store.x_range(4.0, 4.5).tolist() == []
+
+        # Checking a row keeps the sorted x
+        order = store._sorted()
+        data_handler.table.set_checked(1, True)
+        assert store._sorted() is order
+        assert store.x_order().tolist() == [1, 2, 3, 0, 4]
+        assert store.x_range(-np.inf, 2.0).tolist() == [1, 2, 3]
+        # Narrow windows sort the positions instead of marking every row
+        store.range_sort_fraction = 1
+        assert store.x_range(1.5, 3.0).tolist() == [0, 2, 3]
+
+    def test_load_data_binary(self, data_handler: DataHandler):
+        values = np.arange(12, dtype=float).reshape(3, 4)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "test.npy")
+            np.save(data_path, values)
+            data_handler.load_data(QUrl.fromLocalFile(data_path).toString())
+            # Memory-mapped, the columns are views of the file
+            base = data_handler.store.values
+            while isinstance(base, np.ndarray) and not isinstance(base, np.memmap):
+                base = base.base
+            assert isinstance(base, np.memmap)
+            np.testing.assert_array_equal(data_handler.store.values, values.T)
+
+            data_handler.table.set_value(0, 0, "7")
+            assert data_handler.data["x"].tolist() == [7.0, 4.0, 8.0]
+            assert np.load(data_path)[0, 0] == 0.0
+
+            data_path = os.path.join(tmpdir, "test.npz")
+            np.savez(data_path, y=[2.0, 3.0], x=[0.0, 1.0], sx=[0.5, 0.5])
+            data_handler.load_data(QUrl.fromLocalFile(data_path).toString())
+            assert data_handler.data.values.tolist() == [
+                [0.0, 2.0, 0.0, 0.5],
+                [1.0, 3.0, 0.0, 0.5],
+            ]
+
+            # Without h5py the error names the package to install
+            data_handler._msg_handler.raise_error = MagicMock()
+            data_path = os.path.join(tmpdir, "test.h5")
+            with patch.dict(sys.modules, {"h5py": None}):
+                data_handler.load_data(QUrl.fromLocalFile(data_path).toString())
+            data_handler._msg_handler.raise_error.assert_called_once_with(
+                "Para abrir arquivos .h5 é preciso instalar o pacote h5py."
+            )
+
+    def test_load_data_hdf5(self, data_handler: DataHandler):
+        h5py = pytest.importorskip("h5py")
+        data_handler._msg_handler.raise_error = MagicMock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "named.h5")
+            with h5py.File(data_path, "w") as file:
+                file["y"] = [2.0, 3.0]
+                file["x"] = [0.0, 1.0]
+                file["sy"] = [0.5, 0.5]
+            data_handler.load_data(QUrl.fromLocalFile(data_path).toString())
+            assert data_handler.data.values.tolist() == [
+                [0.0, 2.0, 0.5, 0.0],
+                [1.0, 3.0, 0.5, 0.0],
+            ]
+
+            # Wide datasets ask for the columns and read only the chosen ones
+            chosen = []
+            data_handler.chooseColumns.connect(lambda *args: chosen.append(args))
+            data_path = os.path.join(tmpdir, "wide.h5")
+            with h5py.File(data_path, "w") as file:
+                file["data"] = np.arange(30.0).reshape(6, 5)
+            url = QUrl.fromLocalFile(data_path).toString()
+            data_handler.load_data(url)
+            assert chosen == [(url, [f"Coluna {i + 1}" for i in range(5)])]
+            data_handler.load_data_columns(url, [4, 0, -1, 4])
+            assert data_handler.data.values[:2].tolist() == [
+                [4.0, 0.0, 0.0, 4.0],
+                [9.0, 5.0, 0.0, 9.0],
+            ]
+            data_handler._msg_handler.raise_error.assert_not_called()
+
+    def test_load_data_parquet(self, data_handler: DataHandler):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        chosen = []
+        data_handler.chooseColumns.connect(lambda *args: chosen.append(args))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "wide.parquet")
+            table = {name: [i, i + 10.0] for i, name in enumerate("tabcde")}
+            pq.write_table(pa.table(table), data_path)
+            url = QUrl.fromLocalFile(data_path).toString()
+            data_handler.load_data(url)
+            assert data_handler.store is None
+            assert chosen == [(url, ["1: t", "2: a", "3: b", "4: c", "5: d", "6: e"])]
+            data_handler.load_data_columns(url, [0, 4, -1, 2])
+            assert data_handler.data.values.tolist() == [
+                [0.0, 4.0, 0.0, 2.0],
+                [10.0, 14.0, 0.0, 12.0],
+            ]
+
+    def test_load_data_choose_columns(self, data_handler: DataHandler):
+        chosen = []
+        data_handler.chooseColumns.connect(lambda *args: chosen.append(args))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "test.csv")
+            with open(data_path, "w") as f:
+                f.write("t,a,b,c,d,e\n1,2,3,4,5,6\n7,8,9,10,11,12")
+            url = QUrl.fromLocalFile(data_path).toString()
+            data_handler.load_data(url)
+            assert data_handler.store is None
+            assert chosen == [(url, ["1: t", "2: a", "3: b", "4: c", "5: d", "6: e"])]
+
+            data_handler.load_data_columns(url, [0, 4, -1, 2])
+            assert data_handler.data.values.tolist() == [
+                [1.0, 5.0, 0.0, 3.0],
+                [7.0, 11.0, 0.0, 9.0],
+            ]
+            assert data_handler.has_sy == False
+            assert data_handler.has_sx == True
+
+            data_path = os.path.join(tmpdir, "test.npy")
+            np.save(data_path, np.arange(48.0).reshape(8, 6))
+            url = QUrl.fromLocalFile(data_path).toString()
+            data_handler.load_data(url)
+            assert chosen[-1][1][0] == "Coluna 1"
+            data_handler.load_data_columns(url, [5, 1, 3, -1])
+            assert data_handler.data.values[:2].tolist() == [
+                [5.0, 1.0, 3.0, 0.0],
+                [11.0, 7.0, 9.0, 0.0],
+            ]
+
+    def test_read_appended(self, data_handler: DataHandler):
+        appended = MagicMock()
+        data_handler.dataAppended.connect(appended)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "test.csv")
+            with open(data_path, "w") as f:
+                f.write("1,2,0.1,0.2\n3,4,0.1,0.2\n")
+            data_handler.load_data(QUrl.fromLocalFile(data_path).toString())
+            store = data_handler.store
+
+            # Only whole lines are appended, the rest waits for the next read
+            with open(data_path, "a") as f:
+                f.write("5,6,0.1,0.2\n7,8")
+            data_handler._read_appended()
+            assert data_handler.store is store
+            assert data_handler.data["x"].tolist() == [1.0, 3.0, 5.0]
+            with open(data_path, "a") as f:
+                f.write(",0.1,0.2\n")
+            data_handler._read_appended()
+            assert data_handler.data["y"].tolist() == [2.0, 4.0, 6.0, 8.0]
+            assert appended.call_count == 2
+
+            # A shorter file was rewritten and is loaded again
+            with open(data_path, "w") as f:
+                f.write("9,10,0.1,0.2\n")
+            data_handler._read_appended()
+            assert data_handler.data["x"].tolist() == [9.0]
+
+    def test_read_appended_partial_line(self, data_handler: DataHandler):
+        data_handler.set_watch(True)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "test.txt")
+            with open(data_path, "w") as f:
+                f.write("1 2\n3 4\n5")
+            data_handler.load_data(QUrl.fromLocalFile(data_path).toString())
+            # The line still being written is left for the next read
+            assert data_handler.data["x"].tolist() == [1.0, 3.0]
+            assert data_handler._offset == len("1 2\n3 4\n")
+
+            with open(data_path, "a") as f:
+                f.write(" 6\n7 8\n")
+            data_handler._read_appended()
+            assert data_handler.data["x"].tolist() == [1.0, 3.0, 5.0, 7.0]
+            assert data_handler.data["y"].tolist() == [2.0, 4.0, 6.0, 8.0]
+        data_handler.set_watch(False)
+
+    def test_load_files(self, data_handler: DataHandler):
+        data_handler._msg_handler.raise_warn = MagicMock()
+        data_handler._msg_handler.raise_error = MagicMock()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, text in [
+                ("run10.csv", "1,2\n3,4"),
+                ("run2.txt", "x y\n1,5 2\n3 4"),
+                ("wide.csv", "1,2,3,4,5\n6,7,8,9,10"),
+                ("notes.md", "1,2"),
+            ]:
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write(text)
+            datasets = data_handler.load_files(tmpdir)
+
+        assert [name for name, _ in datasets] == ["run2.txt", "run10.csv"]
+        assert datasets[0][1].values.T.tolist() == [[1.5, 2, 0, 0], [3, 4, 0, 0]]
+        assert datasets[1][1].values.T.tolist() == [[1, 2, 0, 0], [3, 4, 0, 0]]
+        assert data_handler.store is None
+        data_handler._msg_handler.raise_warn.assert_called_once_with(
+            "run2.txt: Linhas com valores não numéricos removidas."
+        )
+        data_handler._msg_handler.raise_error.assert_called_once_with(
+            "1 arquivo(s) não carregado(s):\nwide.csv: Há mais do que 4 colunas."
+        )
+
+    def test_parse_cache(self, data_handler: DataHandler):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "test.csv")
+            with open(data_path, "w") as f:
+                f.write("1,2\na,b\n3,4\n")
+            url = QUrl.fromLocalFile(data_path).toString()
+            data_handler._msg_handler.raise_warn = MagicMock()
+            data_handler.load_data(url)
+            data_handler.table.set_value(0, 0, "9")
+
+            # Same file and options: only the column count is peeked
+            with patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+                data_handler.load_data(url)
+                assert data_handler.read_numeric(data_path).values.tolist() == [
+                    [1.0, 2.0],
+                    [3.0, 4.0],
+                ]
+            assert all("nrows" in call.kwargs for call in read_csv.call_args_list)
+            assert data_handler.data["x"].tolist() == [1.0, 3.0]
+            assert data_handler._msg_handler.raise_warn.call_count == 3
+
+            with open(data_path, "a") as f:
+                f.write("5,6\n")
+            data_handler.load_data(url)
+            assert data_handler.data["x"].tolist() == [1.0, 3.0, 5.0]
+        parse_cache.clear()
+
+    def test_parse_cache_skips_uncached_sources(self, data_handler: DataHandler):
+        with patch.object(parse_cache, "put") as put:
+            data_handler._fill_df_with_clipboardText("1 2\n3 4\n")
+            put.assert_not_called()
+            with tempfile.TemporaryDirectory() as tmpdir:
+                data_path = os.path.join(tmpdir, "test.txt")
+                with open(data_path, "w") as f:
+                    f.write("1 2\n3 4\n")
+                with patch.object(parse_cache, "max_bytes", 16):
+                    data_handler.read_numeric(data_path)
+                put.assert_not_called()
+                data_handler.read_numeric(data_path)
+                put.assert_called_once()
+
+    def test_parse_cache_eviction(self):
+        cache = ParseCache(max_bytes=2 * 8 * 10)
+        for name in "abc":
+            cache.put((name,), np.zeros(10))
+        assert cache.get(("a",)) is None
+        assert cache.get(("b",)) is not None
+        cache.put(("d",), np.zeros(10))
+        assert cache.get(("b",)) is not None
+        assert cache.get(("c",)) is None
+        assert cache.nbytes == 160
+        assert not cache.get(("d",))[0].flags.writeable
+
+    def test_transforms(self, data_handler: DataHandler):
+        values = np.array(
+            [[1.0, 2.0, 4.0, 0.0], [1.0, 2.0, -1.0, 3.0], [0.1] * 4, [0.2] * 4]
+        )
+        data_handler._set_store(DataStore(values))
+        data_handler._msg_handler.raise_warn = MagicMock()
+        assert data_handler.set_transforms({"x": "1/x^2", "y": "ln(y)"})
+        data_handler.load_table()
+        # Row 2 (y < 0) and row 3 (x = 0) are out of the domain
+        data_handler._msg_handler.raise_warn.assert_called_once()
+        np.testing.assert_allclose(data_handler.data["x"], [1.0, 0.25])
+        np.testing.assert_allclose(data_handler.data["y"], [0.0, np.log(2.0)])
+        # First order: |d(x^-2)/dx| sx and sy / y
+        np.testing.assert_allclose(data_handler.data["sx"], [0.4, 0.05])
+        np.testing.assert_allclose(data_handler.data["sy"], [0.1, 0.05])
+        assert data_handler.transforms == {"x": "1/x^2", "y": "ln(y)"}
+
+        # Cached until the source columns change
+        derived = data_handler.fit_store
+        assert data_handler.fit_store is derived
+        # Unchecking a row only updates the mask of the transformed store
+        data_handler.table.set_checked(1, False)
+        assert data_handler.fit_store is derived
+        assert derived.mask.tolist() == [True, False, False, False]
+        data_handler.table.set_checked(1, True)
+        assert data_handler.fit_store.mask.tolist() == [True, True, False, False]
+        data_handler.table.set_value(0, 1, "3")
+        assert data_handler.fit_store is not derived
+        assert data_handler.data["y"][0] == pytest.approx(np.log(3.0))
+
+        # y depending on x propagates both uncertainties
+        assert data_handler.set_transforms({"x": "", "y": "y*x"})
+        sy = np.hypot(2.0 * 0.1, 2.0 * 0.2)
+        assert data_handler.data["sy"][1] == pytest.approx(sy)
+        assert data_handler.data["x"].tolist() == [1.0, 2.0, 4.0, 0.0]
+
+        data_handler._msg_handler.raise_error = MagicMock()
+        assert not data_handler.set_transforms({"y": "__import__('os')"})
+        data_handler._msg_handler.raise_error.assert_called_once()
+        assert data_handler.transforms == {"y": "y*x"}
+        data_handler.reset()
+        assert data_handler.transforms == {}
+
+    def test_transforms_rejected(self, data_handler: DataHandler):
+        values = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [0.1] * 3, [0.2] * 3])
+        data_handler._set_store(DataStore(values.copy()))
+        data_handler._msg_handler.raise_error = MagicMock()
+        # Extra arguments would reach numpy as out=, calls only on functions
+        for expression in ["sin(x, y)", "log(x, out=y)", "sin()", "x(2)", "pi(1)"]:
+            assert not data_handler.set_transforms({"x": expression})
+        # Functions are not values
+        for expression in ["sin", "sin + x", "exp(log)"]:
+            assert not data_handler.set_transforms({"y": expression})
+        assert data_handler._msg_handler.raise_error.call_count == 8
+        assert data_handler.transforms == {}
+        data_handler.load_table()
+        np.testing.assert_array_equal(data_handler.store.values, values)
+
+        # A failing evaluation leaves the data untransformed
+        data_handler._msg_handler.raise_error.reset_mock()
+        assert data_handler.set_transforms({"x": "log(x)"})
+        with patch.object(ColumnTransform, "apply", side_effect=TypeError("falhou")):
+            data_handler.load_table()
+        data_handler._msg_handler.raise_error.assert_called_once()
+        assert data_handler.transforms == {}
+        assert data_handler.data["x"].tolist() == [1.0, 2.0, 3.0]
+        np.testing.assert_array_equal(data_handler.store.values, values)
+
     def test_data(self, data_handler: DataHandler):
-        data = [[1, 2, 3, 4], [5, 6, 7, 8]]
+        data = [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]]
         df = pd.DataFrame(data, columns=["x", "y", "sy", "sx"])
-        data_handler._data = df
+        data_handler._set_store(DataStore.from_frame(df))
         x, y, sy, sx = data_handler.separated_data
         pd.testing.assert_series_equal(x, df["x"])
         pd.testing.assert_series_equal(y, df["y"])
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+from atus.src.DataHandler import DataHandler
+from atus.src.DataStore import DataStore
+from atus.src.Histogram import Histogram
+from atus.src.MessageHandler import MessageHandler
+from atus.src.Model import Model
+from atus.src.ParseCache import parse_cache
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+from PyQt5.QtCore import QUrl
+from io import StringIO
+import pandas as pd
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+# Ingestion benchmarks, out of the default run (see pytest.ini):
+#   pytest -m benchmark --no-cov
+# ATUS_BENCH_ROWS="10,1000,100000,10000000" picks the sizes,
+# ATUS_BENCH_SAVE=1 writes the results to the baseline and
+# ATUS_BENCH_TOLERANCE sets how much slower than the baseline still passes.
+# Speeds are compared as ratios to a plain pandas parse timed on the same
+# machine at the start of the run, so the baseline holds no absolute timings.
+BASELINE = os.path.join(os.path.dirname(__file__), "benchmarks", "baseline.json")
+ROWS = [
+    int(rows)
+    for rows in os.environ.get("ATUS_BENCH_ROWS", "10,1000,100000").split(",")
+]
+SAVE = os.environ.get("ATUS_BENCH_SAVE", "") == "1"
+TOLERANCE = float(os.environ.get("ATUS_BENCH_TOLERANCE", "2"))
+# Rows of the calibration parse
+CALIBRATION_ROWS = 10**5
+# Below this many rows the timings are mostly noise, they are only reported
+MIN_CHECKED_ROWS = 1000
+# The table arrives from QML as lists of strings, larger tables are not realistic
+MAX_TABLE_ROWS = 10**6
+# One junk row (header, text, empty cell) every JUNK_EVERY rows
+JUNK_EVERY = 1000
+
+
+def _values(rows: int, ncols: int) -> np.ndarray:
+    rng = np.random.default_rng(rows * 10 + ncols)
+    values = rng.uniform(-1e3, 1e3, (rows, ncols))
+    # Uncertainties are positive
+    values[:, 2:] = np.abs(values[:, 2:]) + 0.1
+    return values
+
+
+def _junk(rows: int) -> range:
+    return range(JUNK_EVERY // 2, rows, JUNK_EVERY)
+
+
+def _chunks(rows: int, ncols: int, sep: str, decimal: str, size: int = 10**5):
+    """Rows of numbers with a header and junk rows, like files from students.
+
+    Written in blocks so 10^7 rows never need the whole table as strings.
+    """
+    yield sep.join(["x", "y", "sy", "sx"][:ncols]) + "\n"
+    values = _values(rows, ncols)
+    junk = [sep.join(["n/a"] * ncols), sep.join(["valor"] + [""] * (ncols - 1))]
+    for start in range(0, rows, size):
+        cells = np.char.mod("%.6f", values[start : start + size])
+        if decimal == ",":
+            cells = np.char.replace(cells, ".", ",")
+        lines = [sep.join(row) for row in cells.tolist()]
+        for i in _junk(rows):
+            if start <= i < start + size:
+                lines[i - start] = junk[(i // JUNK_EVERY) % 2]
+        yield "\n".join(lines) + "\n"
+
+
+def _text(rows: int, ncols: int, sep: str, decimal: str) -> str:
+    return "".join(_chunks(rows, ncols, sep, decimal))
+
+
+def _measure(run, setup=None, repeat: int = 1) -> tuple[float, float]:
+    """Best time of ``repeat`` runs and the peak traced memory of one more, MiB."""
+    best = np.inf
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    # Separate run: tracemalloc slows Python allocations down
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def _repeat(rows: int) -> int:
+    return 5 if rows <= 10**4 else 3 if rows <= 10**5 else 1
+
+
+@pytest.fixture(scope="module")
+def calibration() -> float:
+    """Rows/s of pandas alone on a clean float table: the unit of the baseline."""
+    buffer = StringIO()
+    np.savetxt(buffer, _values(CALIBRATION_ROWS, 4), fmt="%.6f", delimiter=",")
+    text = buffer.getvalue()
+    times = []
+    for _ in range(7):
+        start = time.perf_counter()
+        pd.read_csv(StringIO(text), header=None, dtype=np.float64, engine="c")
+        times.append(time.perf_counter() - start)
+    # Median: one lucky run would make every case look slower
+    return CALIBRATION_ROWS / float(np.median(times))
+
+
+@pytest.fixture(scope="module")
+def results(request, calibration):
+    results = {}
+    yield results
+    capture = request.config.pluginmanager.get_plugin("capturemanager")
+    with capture.global_and_fixture_disabled():
+        print(f"\ncalibration: {calibration:.4g} rows/s")
+        print(
+            f"{'case':<40}{'rows':>10}{'rows/s':>12}{'relative':>10}"
+            f"{'MB/s':>9}{'peak MiB':>10}"
+        )
+        for case, result in results.items():
+            print(
+                f"{case:<40}{result['rows']:>10}"
+                f"{result['relative'] * calibration:>12.4g}"
+                f"{result['relative']:>10.3g}{result['mb_per_s']:>9.3g}"
+                f"{result['peak_mib']:>10.3g}"
+            )
+    if SAVE and results:
+        baseline = {"cases": {}}
+        if os.path.exists(BASELINE):
+            with open(BASELINE, encoding="utf-8") as file:
+                baseline = json.load(file)
+        baseline["machine"] = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        }
+        baseline["cases"].update(
+            {
+                case: {
+                    key: result[key] for key in ("rows", "relative", "peak_mib")
+                }
+                for case, result in results.items()
+            }
+        )
+        baseline["cases"] = dict(sorted(baseline["cases"].items()))
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        with open(BASELINE, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=4)
+            file.write("\n")
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    if not os.path.exists(BASELINE):
+        return {}
+    with open(BASELINE, encoding="utf-8") as file:
+        return json.load(file)["cases"]
+
+
+@pytest.fixture
+def data_handler():
+    messageHandler = MessageHandler()
+    messageHandler.raise_warn = MagicMock()
+    messageHandler.raise_error = MagicMock()
+    return DataHandler(messageHandler)
+
+
+@pytest.fixture
+def record(request, results, baseline, calibration):
+    """Keeps the result of the case and compares it with the baseline.
+
+    ``relative`` is the speed in rows/s over the calibration speed.
+    """
+
+    def record(rows: int, nbytes: int, seconds: float, peak_mib: float) -> None:
+        case = request.node.name.replace("test_", "", 1)
+        result = {
+            "rows": rows,
+            "relative": rows / seconds / calibration,
+            "mb_per_s": nbytes / seconds / 1e6,
+            "peak_mib": peak_mib,
+        }
+        results[case] = result
+        expected = baseline.get(case)
+        if SAVE or expected is None or rows < MIN_CHECKED_ROWS:
+            return None
+        assert result["relative"] >= expected["relative"] / TOLERANCE, (
+            f"{case}: {result['relative']:.3g} times the calibration speed, "
+            f"baseline {expected['relative']:.3g}"
+        )
+        assert peak_mib <= 1.5 * expected["peak_mib"] + 1, (
+            f"{case}: peak of {peak_mib:.3g} MiB, baseline {expected['peak_mib']:.3g}"
+        )
+
+    return record
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    """Synthetic files, written once per size and format."""
+    directory = tmp_path_factory.mktemp("bench")
+    cache = {}
+
+    def files(rows: int, ncols: int, extension: str) -> str:
+        key = (rows, ncols, extension)
+        if key not in cache:
+            sep, decimal = (",", ".") if extension == ".csv" else ("\t", ",")
+            path = str(directory / f"data_{rows}_{ncols}{extension}")
+            with open(path, "w", encoding="utf-8") as file:
+                file.writelines(_chunks(rows, ncols, sep, decimal))
+            cache[key] = path
+        return cache[key]
+
+    return files
+
+
+@pytest.mark.benchmark
+class TestIngestion:
+    @pytest.mark.parametrize("ncols", [1, 2, 3, 4])
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_read_csv(self, data_handler, files, record, rows, ncols):
+        path = files(rows, ncols, ".csv")
+        seconds, peak = _measure(
+            lambda: data_handler._read_csv(path), parse_cache.clear, _repeat(rows)
+        )
+        assert len(data_handler._df) == rows - len(_junk(rows))
+        record(rows, os.path.getsize(path), seconds, peak)
+
+    @pytest.mark.parametrize("ncols", [1, 2, 3, 4])
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_read_tsv_txt(self, data_handler, files, record, rows, ncols):
+        path = files(rows, ncols, ".txt")
+        seconds, peak = _measure(
+            lambda: data_handler._read_tsv_txt(path), parse_cache.clear, _repeat(rows)
+        )
+        assert len(data_handler._df) == rows - len(_junk(rows))
+        record(rows, os.path.getsize(path), seconds, peak)
+
+    @pytest.mark.parametrize("ncols", [1, 2, 3, 4])
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_fill_df_with_clipboardText(self, data_handler, record, rows, ncols):
+        text = _text(rows, ncols, "\t", ",")
+        seconds, peak = _measure(
+            lambda: data_handler._fill_df_with_clipboardText(text),
+            repeat=_repeat(rows),
+        )
+        assert len(data_handler._df) == rows - len(_junk(rows))
+        record(rows, len(text), seconds, peak)
+
+    @pytest.mark.parametrize("ncols", [2, 3, 4])
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_load_data_bottom(self, data_handler, record, rows, ncols):
+        text = _text(rows, ncols, "\t", ",")
+
+        def setup():
+            data_handler._set_store(DataStore(np.ones((4, 10))))
+
+        seconds, peak = _measure(
+            lambda: data_handler._load_data_bottom(text), setup, _repeat(rows)
+        )
+        assert len(data_handler.store) == 10 + rows - len(_junk(rows))
+        record(rows, len(text), seconds, peak)
+
+    @pytest.mark.parametrize(
+        "rows", [rows for rows in ROWS if rows <= MAX_TABLE_ROWS] or [MAX_TABLE_ROWS]
+    )
+    def test_loadDataTable(self, data_handler, record, rows):
+        cells = np.char.mod("%.6f", _values(rows, 4)).tolist()
+        table = [row + [int(i % 10 != 0)] for i, row in enumerate(cells)]
+        seconds, peak = _measure(
+            lambda: data_handler.loadDataTable(table), repeat=_repeat(rows)
+        )
+        assert len(data_handler.data) == rows - (rows + 9) // 10
+        record(rows, 0, seconds, peak)
+
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_check_data(self, data_handler, files, record, rows):
+        path = files(rows, 1, ".txt")
+        histogram = Histogram(None, data_handler._msg_handler, data_handler)
+        url = QUrl.fromLocalFile(path).toString()
+        package = {}
+
+        def run():
+            package.update(histogram.check_data(url))
+
+        seconds, peak = _measure(run, parse_cache.clear, _repeat(rows))
+        assert package["isValid"]
+        record(rows, os.path.getsize(path), seconds, peak)
+
+
+@pytest.mark.benchmark
+class TestFit:
+    @pytest.mark.parametrize("rows", ROWS)
+    def test_fit_full_range(self, record, rows):
+        # Default window of the fit page: -inf to inf through the sorted-x index
+        values = _values(rows, 4)
+        values[:, 1] = 2.0 * values[:, 0] + 1.0
+        store = DataStore(values.T.copy())
+        model = Model("")
+        model.set_expression(exp="a*x+b", ind_var="x")
+
+        def setup():
+            store.set_value(0, 1, values[0, 1])
+            model.data = store.frame()
+            model.range_index = store.x_range
+            model._has_sx = False
+            model.xmin, model.xmax = -np.inf, np.inf
+
+        seconds, peak = _measure(
+            lambda: model.fit(wsx=True, wsy=False), setup, _repeat(rows)
+        )
+        assert len(model.inliers) == rows
+        record(rows, 0, seconds, peak)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from atus.src.Model import Model
+from atus.src.Model_multiplot import MultiModel
 from atus.src.DataHandler import DataHandler
+from atus.src.DataStore import DataStore
 from atus.src.MessageHandler import MessageHandler
 import pytest
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
 
 
@@ -115,3 +118,102 @@ class TestModel:
         model.set_expression(exp=expression, ind_var=ind_var)
         assert model._create_model() is False
         msg_handler_mock.raise_error.assert_called_with(expected_error_msg)
+
+    @pytest.mark.parametrize("wsy", [False, True])
+    def test_fit_reduce_repeated_x(self, wsy: bool):
+        rng = np.random.default_rng(3)
+        x = np.repeat(np.arange(1.0, 11.0), 5)
+        sy = rng.uniform(0.1, 0.5, len(x))
+        y = 2.0 * x + 1.0 + rng.normal(0, sy)
+        df = pd.DataFrame({"x": x, "y": y, "sy": sy, "sx": np.zeros(len(x))})
+
+        results = []
+        for reduce_tol in (None, 0):
+            model = Model("")
+            model.set_expression(exp="a*x + b", ind_var="x")
+            model.data = df
+            model._has_sx = False
+            model.reduce_tol = reduce_tol
+            model.fit(wsx=True, wsy=wsy)
+            results.append(model)
+
+        full, reduced = results
+        assert reduced._reduction[:2] == (50, 10)
+        assert "Redução: 50 pontos ajustados como 10 grupos" in reduced._report_fit
+        assert full._result.chisqr == pytest.approx(reduced._result.chisqr)
+        for name, (value, error) in full.get_params().items():
+            assert reduced.get_params()[name][0] == pytest.approx(value)
+            assert reduced.get_params()[name][1] == pytest.approx(error)
+
+    def test_fit_reduce_bins(self):
+        x = np.linspace(0, 10, 1001)
+        df = pd.DataFrame(
+            {"x": x, "y": 3.0 * x, "sy": np.ones(len(x)), "sx": np.zeros(len(x))}
+        )
+        model = Model("")
+        model.set_expression(exp="a*x", ind_var="x")
+        model.data = df
+        model._has_sx = False
+        model.reduce_tol = 0.5
+        model.fit(wsx=True, wsy=False)
+        assert model._reduction[1] == 21
+        assert model.get_params()["a"][0] == pytest.approx(3.0)
+
+    def test_fit_range_masks(self):
+        x = np.arange(10.0)
+        df = pd.DataFrame(
+            {"x": x, "y": 2.0 * x, "sy": np.ones(10), "sx": np.zeros(10)}
+        )
+        model = Model("")
+        model.set_expression(exp="a*x", ind_var="x")
+        model.data = df
+        model._has_sx = False
+        model.xmin, model.xmax = 2.0, 6.0
+        model.fit(wsx=True, wsy=False)
+        assert model.inliers.tolist() == [2, 3, 4, 5, 6]
+        assert model.outliers.tolist() == [0, 1, 7, 8, 9]
+        assert model.get_params()["a"][0] == pytest.approx(2.0)
+
+        # Same window through the sorted-x index of a store
+        store = DataStore(df.to_numpy().T[:, ::-1])
+        model.data = store.frame()
+        model.range_index = store.x_range
+        model.fit(wsx=True, wsy=False)
+        assert model.inliers.tolist() == [3, 4, 5, 6, 7]
+        assert model.get_params()["a"][0] == pytest.approx(2.0)
+
+        # Unchecked rows: one index array from the table mask and the range
+        store.set_checked(2, False)
+        store.set_checked(4, False)
+        model.data = store.view()
+        model.rows = store.mask
+        model.range_index = store.x_range
+        model.fit(wsx=True, wsy=False)
+        assert model._indices.tolist() == [3, 5, 6, 7]
+        # Positions in the checked rows, as the plot draws them
+        assert model.data[0].tolist() == [9, 8, 6, 4, 3, 2, 1, 0]
+        assert model.inliers.tolist() == [2, 3, 4, 5]
+        assert model.outliers.tolist() == [0, 1, 6, 7]
+        assert model.get_params()["a"][0] == pytest.approx(2.0)
+
+    def test_multimodel_checked_rows(self):
+        arquivo = {
+            "df": [
+                ["1", "2", "3", "4", 1],
+                ["5", "6", "7", "8", 0],
+                [9, 10, 11, 12, 1],
+            ],
+            "expr": "",
+            "params": {},
+        }
+        model = MultiModel({}, [arquivo])
+        assert model.dfs[0].values.tolist() == [
+            [1.0, 2.0, 3.0, 4.0],
+            [9.0, 10.0, 11.0, 12.0],
+        ]
+        assert model.num_cols == [4]
+
+        # Files from a folder arrive as stores, used without conversion
+        store = model.stores[0]
+        arquivo["df"] = store
+        assert MultiModel({}, [arquivo]).stores[0] is store
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from atus.src.DataHandler import DataHandler
+from atus.src.DensityPlot import density_plot
+from atus.src.DataStore import DataStore
+from atus.src.MatPlotLib import Canvas
+from atus.src.MessageHandler import MessageHandler
+from atus.src.Model import Model
+from atus.src.Plot import SinglePlot
+from unittest.mock import MagicMock
+import numpy as np
+from matplotlib import colors
+from matplotlib.figure import Figure
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class CanvasPages(QObject):
+    """Só a troca de páginas do Canvas."""
+
+    page_activated = pyqtSignal(int)
+
+    def __init__(self):
+        super().__init__()
+        self.page = None
+
+    def activate_page(self, page: int) -> None:
+        self.page = page
+        self.page_activated.emit(page)
+
+
+class TestSinglePlot:
+    def test_refit_waits_for_its_page(self):
+        messageHandler = MessageHandler()
+        datahandler = DataHandler(messageHandler)
+        model = Model(messageHandler)
+        canvas = CanvasPages()
+        single_plot = SinglePlot(canvas, model, datahandler, messageHandler)
+        plotted = MagicMock()
+        single_plot.plot_signal.connect(plotted)
+
+        x = np.arange(5.0)
+        datahandler._set_store(DataStore(np.array([x, 2.0 * x, x + 1, 0.0 * x])))
+        canvas.activate_page(SinglePlot.page)
+        single_plot._set_model_data()
+        model.set_expression(exp="a*x", ind_var="x")
+        model._has_sx = False
+        model.fit(wsx=True, wsy=False)
+
+        # Rows appended while the histogram is shown: nothing is drawn there
+        canvas.activate_page(4)
+        datahandler.dataAppended.emit()
+        plotted.assert_not_called()
+        canvas.activate_page(2)
+        plotted.assert_not_called()
+        # Back to the single plot, the pending refit runs once
+        canvas.activate_page(SinglePlot.page)
+        plotted.assert_called_once()
+        canvas.activate_page(4)
+        canvas.activate_page(SinglePlot.page)
+        plotted.assert_called_once()
+
+        datahandler.dataAppended.emit()
+        assert plotted.call_count == 2
+
+
+class TestDensity:
+    def test_log_axis_skips_non_positive(self):
+        figure = Figure()
+        ax = figure.add_subplot()
+        x = np.array([-1.0, 0.0, 1.0, 10.0, 100.0])
+        y = np.array([1.0, 2.0, -3.0, 10.0, 100.0])
+        image = density_plot(ax, x, y, "C0")
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlim(0.5, 200.0)
+        ax.set_ylim(0.5, 200.0)
+        image.aggregate()
+        # Only the points with x > 0 and y > 0 are counted, none in bin 0
+        assert image.get_array().sum() == 2
+        assert image.get_array()[0, 0] is np.ma.masked
+
+    def test_scatter_colors_per_point(self):
+        messageHandler = MessageHandler()
+        canvas = Canvas(messageHandler)
+        figure = Figure()
+        canvas.axes1 = figure.add_subplot(2, 1, 1)
+        canvas.axes2 = figure.add_subplot(2, 1, 2)
+        canvas.density_mode = True
+        x = np.arange(6.0)
+        c = np.array([colors.to_rgba("C0")] * 6)
+        c[[1, 4], 3] = 0.25
+        canvas.plot_scatter(x, x, {"c": c}, y_r=x - 1)
+        # One image per color, the outliers keep their transparency
+        for ax in (canvas.axes1, canvas.axes2):
+            images = ax.get_images()
+            assert sorted(len(image.x) for image in images) == [2, 4]
+            assert sorted(image.cmap(1.0)[3] for image in images) == [0.25, 1.0]
+
+
+class TestCanvas:
+    def test_exporter_thread_stops(self):
+        canvas = Canvas(MessageHandler())
+        # Nothing runs until the first export
+        assert not canvas.exporter_thread.isRunning()
+        canvas.exporter_thread.start()
+        canvas.stop_exporter()
+        assert canvas.exporter_thread.isFinished()